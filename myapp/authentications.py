@@ -1,28 +1,158 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
 from django.contrib.auth.models import User
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
-from myapp.utils import get_redis_client
+from myapp.utils import get_async_redis_client, get_redis_client
+
+
+class TokenUserCache:
+    """
+    In-process LRU of token -> resolved user, bounded by size and TTL.
+
+    Sits in front of the Redis token lookup and the `User` query so a warm
+    token is resolved without any network round trip. Entries live at most
+    `ttl` seconds, which also bounds how long a token revoked from another
+    process can stay usable here.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            entry = self._entries.get(token)
+
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(token)
+            self.hits += 1
+
+        # 요청마다 독립된 인스턴스를 돌려줘서 캐시된 객체가 오염되지 않도록 함
+        return copy.copy(entry[1])
+
+    def set(self, token, user):
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[token] = (time.monotonic() + self.ttl, copy.copy(user))
+            self._entries.move_to_end(token)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token):
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for token in [token for token, (_, user) in self._entries.items() if user.pk == user_id]:
+                del self._entries[token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+token_user_cache = TokenUserCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE, ttl=settings.AUTH_TOKEN_CACHE_TTL)
+
+def resolve_token_user(token):
+    user = token_user_cache.get(token)
+
+    if user is not None:
+        return user
 
+    user_id = get_redis_client().get(token)
+
+    if not user_id:
+        raise AuthenticationFailed('Invalid token.')
+
+    try:
+        user = User.objects.get(pk=int(user_id))
+
+    except User.DoesNotExist:
+        raise AuthenticationFailed('User not found.')
+
+    token_user_cache.set(token, user)
+    return user
+
+async def aresolve_token_user(token):
+    """`resolve_token_user` for async views, using `redis.asyncio` and the async ORM."""
+    user = token_user_cache.get(token)
+
+    if user is not None:
+        return user
+
+    user_id = await get_async_redis_client().get(token)
+
+    if not user_id:
+        raise AuthenticationFailed('Invalid token.')
+
+    try:
+        user = await User.objects.aget(pk=int(user_id))
+
+    except User.DoesNotExist:
+        raise AuthenticationFailed('User not found.')
+
+    token_user_cache.set(token, user)
+    return user
+
+def revoke_token(token):
+    get_redis_client().delete(token)
+    token_user_cache.invalidate(token)
+
+def get_bearer_token(request):
+    auth_header = request.headers.get("Authorization")
+
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return None
+
+    return auth_header.split()[1]
 
 class UserTokenAuthentication(BaseAuthentication):
     def authenticate(self, request):
-        auth_header = request.headers.get("Authorization")
+        token = get_bearer_token(request)
 
-        if not auth_header or not auth_header.startswith('Bearer '):
+        if token is None:
             return None
 
-        token = auth_header.split()[1]
-        redis_client = get_redis_client()
-        user_id = redis_client.get(token)
+        user = resolve_token_user(token)
+
+        return (user, token)
 
-        if not user_id:
-            raise AuthenticationFailed('Invalid token.')
+    async def aauthenticate(self, request):
+        token = get_bearer_token(request)
 
-        try:
-            user = User.objects.get(pk=int(user_id))
+        if token is None:
+            return None
 
-        except User.DoesNotExist:
-            raise AuthenticationFailed('User not found.')
+        user = await aresolve_token_user(token)
 
         return (user, token)
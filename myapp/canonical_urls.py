@@ -0,0 +1,96 @@
+"""
+Canonical URLs: every link points to the `CanonicalUrl` of its normalized URL,
+so links to the same page can be grouped ("who else saved this?") and per-URL
+data such as `LinkMetadata` is stored once.
+
+Rows are looked up by the SHA-256 of the normalized URL. The digest has a fixed
+width, so its unique index stays small however long the URLs are.
+
+Links still store the URL as it was typed in `Link.url`, because the API and
+exports return it and normalization drops parts that can matter to the user
+(fragments, tracking parameters, trailing slashes). Canonical rows therefore add
+storage for the links themselves; what they save is per-URL data that would
+otherwise be repeated on every link to the same page.
+
+Migration 0017 carries its own copy of `normalize_url` and `hash_url`; changing
+them here doesn't rewrite existing rows.
+"""
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from myapp.models import CanonicalUrl
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+# 같은 페이지를 가리키지만 URL만 달라지게 하는 추적용 파라미터
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'gbraid', 'wbraid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+                   '_ga', '_gl'}
+TRACKING_PARAM_PREFIXES = ('utm_',)
+
+
+def is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+def normalize_url(url):
+    """
+    Lowercase the scheme and host, drop credentials, default ports, fragments
+    and tracking parameters, sort the query and strip trailing slashes from
+    non-root paths. Raises ValueError for URLs without an http(s) scheme or host.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = parts.hostname
+
+    if scheme not in DEFAULT_PORTS or not host:
+        raise ValueError(f"Not an http(s) URL: {url!r}")
+
+    if ':' in host:
+        host = f'[{host}]'
+
+    port = parts.port
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f'{host}:{port}'
+
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if not is_tracking_param(name)))
+
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+def hash_url(normalized_url):
+    return hashlib.sha256(normalized_url.encode()).hexdigest()
+
+def get_canonical_url_ids(urls):
+    """
+    `{url: CanonicalUrl id}` for `urls`, creating missing rows, in two queries
+    however many URLs there are. URLs that aren't http(s) are left out.
+    """
+    hashes = {}
+    normalized_urls = {}
+
+    for url in set(urls):
+        try:
+            normalized_url = normalize_url(url)
+        except ValueError:
+            continue
+
+        hashes[url] = hash_url(normalized_url)
+        normalized_urls[hashes[url]] = normalized_url
+
+    if not hashes:
+        return {}
+
+    # 동시에 같은 URL이 저장되어도 유니크 인덱스가 한 행만 남김
+    CanonicalUrl.objects.bulk_create(
+        [CanonicalUrl(url=normalized_url, url_hash=url_hash) for url_hash, normalized_url in normalized_urls.items()],
+        ignore_conflicts=True,
+    )
+    ids = dict(CanonicalUrl.objects.filter(url_hash__in=normalized_urls).values_list('url_hash', 'pk'))
+
+    return {url: ids[url_hash] for url, url_hash in hashes.items()}
+
+def assign_canonical_urls(links):
+    """Set `canonical_url_id` on unsaved or changed `links`, for `bulk_create`/`bulk_update` which skip pre_save."""
+    ids = get_canonical_url_ids(link.url for link in links)
+
+    for link in links:
+        link.canonical_url_id = ids.get(link.url)
@@ -0,0 +1,282 @@
+import logging
+from collections import Counter, defaultdict
+from itertools import count
+
+import redis
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from myapp.feed_cache import invalidate_feed_cache
+from myapp.models import Link, LinkCollection, LinkCollectionViewModel
+from myapp.utils import get_async_redis_client, get_redis_client, on_commit_once
+
+logger = logging.getLogger(__name__)
+
+# Set of collection ids that have unflushed views
+PENDING_VIEW_COLLECTIONS_KEY = 'views:pending'
+# Set of viewer ids per collection waiting to be written
+PENDING_VIEWERS_KEY = 'views:pending:{}'
+# Views taken by a flush, kept until they are committed so a crashed flush can be retried
+TAKEN_VIEW_COLLECTIONS_KEY = 'views:taken'
+TAKEN_VIEWERS_KEY = 'views:taken:{}'
+VIEW_FLUSH_LOCK_KEY = 'views:flush-lock'
+# Hash of collection id -> likes_count delta not yet applied to link_collections
+PENDING_LIKE_DELTAS_KEY = 'likes:pending'
+LINK_COUNT_RECONCILE_CHUNK_SIZE = 5000
+
+# on_commit_once는 항목을 set으로 모으므로 같은 컬렉션의 같은 delta가 합쳐지지 않도록 번호를 붙임
+_like_delta_ids = count()
+
+
+def record_view(collection_id, user_id):
+    """
+    Buffer a (collection, viewer) pair in Redis; `flush_pending_views` writes it later.
+    Views are best effort, so a Redis outage drops the view instead of failing the request.
+    """
+    try:
+        pipe = get_redis_client().pipeline(transaction=False)
+        pipe.sadd(PENDING_VIEWERS_KEY.format(collection_id), user_id)
+        pipe.sadd(PENDING_VIEW_COLLECTIONS_KEY, collection_id)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Failed to record view (collection=%s, user=%s): %s", collection_id, user_id, e)
+
+async def arecord_view(collection_id, user_id):
+    """`record_view` for async views."""
+    try:
+        pipe = get_async_redis_client().pipeline(transaction=False)
+        pipe.sadd(PENDING_VIEWERS_KEY.format(collection_id), user_id)
+        pipe.sadd(PENDING_VIEW_COLLECTIONS_KEY, collection_id)
+        await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Failed to record view (collection=%s, user=%s): %s", collection_id, user_id, e)
+
+def _take_pending_views(client, max_collections):
+    """
+    Move up to `max_collections` collections' pending viewers to the taken keys
+    and return them as {collection_id: {viewer_id, ...}}. Views taken by a flush
+    that never finished are returned again first; `write_views` skips the ones
+    it already wrote.
+    """
+    collection_ids = client.smembers(TAKEN_VIEW_COLLECTIONS_KEY)
+
+    if not collection_ids:
+        collection_ids = client.srandmember(PENDING_VIEW_COLLECTIONS_KEY, max_collections) or []
+
+        # MULTI/EXEC로 옮기므로 그 사이 들어온 조회는 옮겨지거나 다음 flush 대상으로 남음
+        pipe = client.pipeline(transaction=True)
+        for collection_id in collection_ids:
+            key = PENDING_VIEWERS_KEY.format(int(collection_id))
+            pipe.sunionstore(TAKEN_VIEWERS_KEY.format(int(collection_id)), [key])
+            pipe.delete(key)
+            pipe.srem(PENDING_VIEW_COLLECTIONS_KEY, collection_id)
+            pipe.sadd(TAKEN_VIEW_COLLECTIONS_KEY, collection_id)
+        pipe.execute()
+
+    collection_ids = [int(collection_id) for collection_id in collection_ids]
+    pipe = client.pipeline(transaction=False)
+    for collection_id in collection_ids:
+        pipe.smembers(TAKEN_VIEWERS_KEY.format(collection_id))
+
+    return {collection_id: {int(viewer_id) for viewer_id in viewer_ids}
+            for collection_id, viewer_ids in zip(collection_ids, pipe.execute()) if viewer_ids}
+
+def _release_taken_views(client, pending):
+    client.delete(TAKEN_VIEW_COLLECTIONS_KEY,
+                  *(TAKEN_VIEWERS_KEY.format(collection_id) for collection_id in pending))
+
+def write_views(pending):
+    """
+    Persist {collection_id: {viewer_id, ...}} with one bulk INSERT and one
+    `views_count` UPDATE per distinct increment. Returns the number of new views.
+    """
+    viewer_ids = set().union(*pending.values())
+    live_collections = set(LinkCollection.objects.filter(pk__in=pending).values_list('pk', flat=True))
+    live_viewers = set(User.objects.filter(pk__in=viewer_ids).values_list('pk', flat=True))
+    existing = set(
+        LinkCollectionViewModel.objects
+        .filter(collection_id__in=live_collections, viewer_id__in=live_viewers)
+        .values_list('collection_id', 'viewer_id')
+    )
+
+    new_views = [
+        LinkCollectionViewModel(collection_id=collection_id, viewer_id=viewer_id)
+        for collection_id, viewers in pending.items() if collection_id in live_collections
+        for viewer_id in viewers if viewer_id in live_viewers and (collection_id, viewer_id) not in existing
+    ]
+
+    if not new_views:
+        return 0
+
+    # bulk_create는 post_save를 보내지 않으므로 increment_view_count 시그널과 중복 집계되지 않음
+    LinkCollectionViewModel.objects.bulk_create(new_views, ignore_conflicts=True, batch_size=1000)
+
+    collections_by_increment = defaultdict(list)
+    for collection_id, increment in Counter(view.collection_id for view in new_views).items():
+        collections_by_increment[increment].append(collection_id)
+
+    for increment, collection_ids in collections_by_increment.items():
+        LinkCollection.objects.filter(pk__in=collection_ids).update(views_count=F('views_count') + increment)
+
+    return len(new_views)
+
+def flush_pending_views(max_collections=1000):
+    client = get_redis_client()
+
+    # 동시에 두 flush가 같은 조회를 중복 집계하지 않도록 잠금
+    lock = client.lock(VIEW_FLUSH_LOCK_KEY, timeout=300)
+    if not lock.acquire(blocking=False):
+        return 0
+
+    try:
+        pending = _take_pending_views(client, max_collections)
+
+        if not pending:
+            _release_taken_views(client, pending)
+            return 0
+
+        # 실패하거나 커밋 전에 워커가 죽으면 가져간 조회가 그대로 남아 다음 flush가 다시 씀
+        with transaction.atomic():
+            written = write_views(pending)
+
+        _release_taken_views(client, pending)
+        return written
+
+    finally:
+        lock.release()
+
+def add_like_delta(collection_id, delta):
+    """
+    Apply a like/unlike to `LinkCollection.likes_count`.
+
+    With LIKE_COUNTER_BUFFERED the delta is accumulated with HINCRBY once the
+    current transaction commits and folded into the row by
+    `reconcile_like_counts`, so concurrent likes on a hot collection no longer
+    queue on its row lock. Otherwise the row is updated in place.
+    """
+    if settings.LIKE_COUNTER_BUFFERED:
+        # 롤백된 좋아요가 카운터에 남지 않도록 커밋 뒤에 버퍼에 넣음
+        on_commit_once('like-deltas', buffer_like_deltas, [(collection_id, delta, next(_like_delta_ids))])
+        return
+
+    apply_like_delta(collection_id, delta)
+
+def apply_like_delta(collection_id, delta):
+    LinkCollection.objects.filter(pk=collection_id).update(likes_count=Greatest(F('likes_count') + delta, 0))
+
+def buffer_like_deltas(items):
+    deltas = Counter()
+    for collection_id, delta, _ in items:
+        deltas[collection_id] += delta
+
+    deltas = {collection_id: delta for collection_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    try:
+        pipe = get_redis_client().pipeline(transaction=False)
+        for collection_id, delta in deltas.items():
+            pipe.hincrby(PENDING_LIKE_DELTAS_KEY, collection_id, delta)
+        pipe.execute()
+    except redis.RedisError as e:
+        # Redis를 쓸 수 없으면 행을 바로 갱신
+        logger.warning("Failed to buffer like deltas %s: %s", deltas, e)
+        for collection_id, delta in deltas.items():
+            apply_like_delta(collection_id, delta)
+
+def reconcile_like_counts():
+    client = get_redis_client()
+
+    pipe = client.pipeline(transaction=True)
+    pipe.hgetall(PENDING_LIKE_DELTAS_KEY)
+    pipe.delete(PENDING_LIKE_DELTAS_KEY)
+    deltas, _ = pipe.execute()
+
+    collections_by_delta = defaultdict(list)
+    for collection_id, delta in deltas.items():
+        if int(delta):
+            collections_by_delta[int(delta)].append(int(collection_id))
+
+    try:
+        with transaction.atomic():
+            for delta, collection_ids in collections_by_delta.items():
+                (LinkCollection.objects
+                 .filter(pk__in=collection_ids)
+                 .update(likes_count=Greatest(F('likes_count') + delta, 0)))
+    except Exception:
+        pipe = client.pipeline(transaction=False)
+        for delta, collection_ids in collections_by_delta.items():
+            for collection_id in collection_ids:
+                pipe.hincrby(PENDING_LIKE_DELTAS_KEY, collection_id, delta)
+        pipe.execute()
+        raise
+
+    return sum(len(collection_ids) for collection_ids in collections_by_delta.values())
+
+def add_links(links):
+    """Count newly created `links` on their collections, one UPDATE per collection."""
+    added = {}
+    for link in links:
+        added_count, added_at = added.get(link.collection_id, (0, link.created_at))
+        added[link.collection_id] = (added_count + 1, max(added_at, link.created_at))
+
+    for collection_id, (added_count, added_at) in added.items():
+        (LinkCollection.objects
+         .filter(pk=collection_id)
+         .update(links_count=F('links_count') + added_count, last_link_added_at=added_at))
+
+def latest_link_created_at():
+    """Correlated subquery of the newest remaining link's `created_at` per collection (NULL without links)."""
+    return Subquery(Link.objects
+                    .filter(collection=OuterRef('pk'))
+                    .order_by()
+                    .values('collection')
+                    .annotate(last=Max('created_at'))
+                    .values('last'))
+
+def remove_links(link_counts):
+    """
+    Uncount `{collection_id: n}` deleted links, one UPDATE per distinct n.
+    `last_link_added_at` is recomputed from the remaining links in the same
+    UPDATE, so deleting the newest link moves it back (NULL once empty).
+    """
+    collections_by_count = defaultdict(list)
+    for collection_id, count in link_counts.items():
+        collections_by_count[count].append(collection_id)
+
+    for count, collection_ids in collections_by_count.items():
+        (LinkCollection.objects
+         .filter(pk__in=collection_ids)
+         .update(links_count=Greatest(F('links_count') - count, 0), last_link_added_at=latest_link_created_at()))
+
+def reconcile_link_counts(chunk_size=LINK_COUNT_RECONCILE_CHUNK_SIZE):
+    """
+    Recompute `links_count` and `last_link_added_at` from the links table in pk
+    chunks and fix the collections that drifted (writes that bypass `add_links`
+    / `remove_links`, such as raw bulk inserts). Returns the number fixed.
+    """
+    links = Link.objects.filter(collection=OuterRef('pk')).order_by().values('collection')
+    actual = LinkCollection.objects.order_by('pk').annotate(
+        actual_links_count=Coalesce(Subquery(links.annotate(count=Count('pk')).values('count')), 0),
+        actual_last_link_added_at=Subquery(links.annotate(last=Max('created_at')).values('last')),
+    ).values_list('pk', 'links_count', 'last_link_added_at', 'actual_links_count', 'actual_last_link_added_at')
+
+    fixed = 0
+    last_pk = 0
+
+    while rows := list(actual.filter(pk__gt=last_pk)[:chunk_size]):
+        for pk, links_count, last_link_added_at, actual_links_count, actual_last_link_added_at in rows:
+            if (links_count, last_link_added_at) != (actual_links_count, actual_last_link_added_at):
+                LinkCollection.objects.filter(pk=pk).update(links_count=actual_links_count,
+                                                            last_link_added_at=actual_last_link_added_at)
+                fixed += 1
+
+        last_pk = rows[-1][0]
+
+    if fixed:
+        invalidate_feed_cache()
+
+    return fixed
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import logging
+from urllib.parse import urlencode
+
+import redis
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from myapp.utils import get_async_redis_client, get_redis_client, json_response, on_commit_once
+
+logger = logging.getLogger(__name__)
+
+# Bumped on writes that change what a cached page shows (collections, links, thumbnails, owners); entries of older
+# generations are never read again. Counter-only changes (likes, views, trending scores) don't bump it and show up
+# once the page expires after PUBLIC_FEED_CACHE_TTL
+FEED_GENERATION_KEY = 'feed:generation'
+FEED_PAGE_KEY = 'feed:{}:{}'
+FEED_PARAMS = ('filter', 'search', 'page', 'page_size', 'pagination', 'cursor', 'expand')
+
+
+def bump_feed_generation():
+    try:
+        get_redis_client().incr(FEED_GENERATION_KEY)
+    except redis.RedisError as e:
+        logger.warning("Failed to invalidate public feed cache: %s", e)
+
+def invalidate_feed_cache():
+    """Drop every cached feed page once the current transaction commits."""
+    if settings.PUBLIC_FEED_CACHE:
+        # 커밋 전에 무효화하면 다른 요청이 이전 데이터를 새 세대로 다시 캐시할 수 있음
+        on_commit_once('feed-invalidation', lambda _: bump_feed_generation())
+
+def normalize_feed_params(request):
+    params = {key: request.GET[key] for key in FEED_PARAMS if key in request.GET}
+
+    if 'search' in params:
+        params['search'] = ' '.join(params['search'].split())
+
+    params.setdefault('filter', 'relevance' if 'search' in params else 'likes')
+
+    if params.get('page') == '1':
+        del params['page']
+
+    return sorted(params.items())
+
+def feed_cache_key(request, generation):
+    # next/previous 링크가 절대 URL이므로 호스트도 키에 포함
+    normalized = request.build_absolute_uri(request.path) + '?' + urlencode(normalize_feed_params(request))
+    return FEED_PAGE_KEY.format(generation, hashlib.sha1(normalized.encode()).hexdigest())
+
+def cached_feed_response(request, build_response):
+    """
+    Serve an anonymous feed page from Redis, calling `build_response` on a miss.
+
+    Responses carry an ETag of their body, so a client sending it back in
+    If-None-Match gets a 304 without a body. Redis errors fall back to
+    building the response.
+    """
+    if not settings.PUBLIC_FEED_CACHE:
+        return build_response()
+
+    try:
+        client = get_redis_client()
+        # 세대를 먼저 읽어야 응답을 만드는 사이 커밋된 쓰기가 이 항목을 무효화함
+        key = feed_cache_key(request, int(client.get(FEED_GENERATION_KEY) or 0))
+        cached = client.get(key)
+    except redis.RedisError as e:
+        logger.warning("Failed to read public feed cache: %s", e)
+        return build_response()
+
+    if cached is None:
+        response = build_response()
+
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+        etag, entry = build_cache_entry(response.data)
+
+        try:
+            client.set(key, entry, ex=settings.PUBLIC_FEED_CACHE_TTL)
+        except redis.RedisError as e:
+            logger.warning("Failed to write public feed cache: %s", e)
+    else:
+        etag, payload = split_cache_entry(cached)
+        response = Response(json.loads(payload))
+
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+
+    response['ETag'] = etag
+    return response
+
+async def acached_feed_response(request, build_data):
+    """
+    `cached_feed_response` for async views: `build_data` is a coroutine
+    function returning the page data, and hits are served as the stored JSON
+    bytes without decoding.
+    """
+    if not settings.PUBLIC_FEED_CACHE:
+        return json_response(await build_data())
+
+    try:
+        client = get_async_redis_client()
+        key = feed_cache_key(request, int(await client.get(FEED_GENERATION_KEY) or 0))
+        cached = await client.get(key)
+    except redis.RedisError as e:
+        logger.warning("Failed to read public feed cache: %s", e)
+        return json_response(await build_data())
+
+    if cached is None:
+        etag, entry = build_cache_entry(await build_data())
+
+        try:
+            await client.set(key, entry, ex=settings.PUBLIC_FEED_CACHE_TTL)
+        except redis.RedisError as e:
+            logger.warning("Failed to write public feed cache: %s", e)
+
+        cached = entry
+
+    etag, payload = split_cache_entry(cached)
+
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(payload, content_type='application/json')
+
+    response['ETag'] = etag
+    return response
+
+def build_cache_entry(data):
+    # 동기/비동기 뷰가 같은 바이트를 저장하므로 ETag도 같음
+    payload = JSONRenderer().render(data)
+    etag = quote_etag(hashlib.sha1(payload).hexdigest())
+    return etag, etag.encode() + b'\n' + payload
+
+def split_cache_entry(entry):
+    etag, payload = entry.split(b'\n', 1)
+    return etag.decode(), payload
@@ -0,0 +1,154 @@
+"""
+Resized WebP copies of thumbnails and avatars, so feed cards don't pull the
+full resolution uploads through CloudFront.
+
+Saving a new thumbnail or avatar URL schedules `tasks.generate_image_variants`
+after commit (when IMAGE_VARIANTS is set) on the IMAGE_VARIANTS_QUEUE queue,
+which the prefork worker of Dockerfile_celery_images consumes so resizing never
+blocks the gevent worker. The task downloads each original of
+at most IMAGE_MAX_SOURCE_BYTES, encodes one WebP per size on a pool of
+IMAGE_RESIZE_WORKERS threads and uploads them under `resized/`. Their URLs are
+stored in `variants` only if the row still points at the same image, and the
+serializers render them as `srcset`, which stays empty until then.
+"""
+import io
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+from PIL import Image, ImageOps
+
+from myapp.feed_cache import invalidate_feed_cache
+from myapp.models import LinkCollectionThumbnail, UserAvatar
+from myapp.s3_gc import cloudfront_key, queue_s3_deletes
+from myapp.share_links import invalidate_collection_share_links
+from myapp.utils import get_boto3_client, on_commit_once
+
+logger = logging.getLogger(__name__)
+
+RESIZED_PREFIX = 'resized/'
+# 썸네일은 비율을 유지한 가로 폭, 아바타는 정사각형 한 변의 길이
+THUMBNAIL_WIDTHS = (320, 640, 960)
+AVATAR_SIZES = (64, 128, 256)
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+IMAGE_MODELS = {
+    'thumbnail': LinkCollectionThumbnail,
+    'avatar': UserAvatar,
+}
+
+
+def variant_key(key, width):
+    return f'{RESIZED_PREFIX}{posixpath.splitext(key)[0]}_{width}w.webp'
+
+def variant_keys(variants):
+    """S3 keys of a row's `variants`, for deleting them along with the replaced original."""
+    return [cloudfront_key(url) for url in (variants or {}).values()]
+
+def resize(image, width, square):
+    if square:
+        return ImageOps.fit(image, (width, width), Image.Resampling.LANCZOS)
+
+    return image.resize((width, max(1, round(image.height * width / image.width))), Image.Resampling.LANCZOS)
+
+def encode_webp(image):
+    buffer = io.BytesIO()
+    image.save(buffer, 'WEBP', quality=settings.IMAGE_WEBP_QUALITY, method=4)
+    return buffer.getvalue()
+
+def open_image(data):
+    """Decode an upload, rotated by its EXIF orientation and converted to a mode WebP can store."""
+    image = Image.open(io.BytesIO(data))
+
+    # 헤더만 읽은 상태에서 크기를 확인해 거대한 이미지는 디코딩하지 않음
+    if image.width * image.height > settings.IMAGE_MAX_PIXELS:
+        raise ValueError(f"Image is too large: {image.width}x{image.height}")
+
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+
+    return image.convert('RGBA' if has_alpha else 'RGB')
+
+def render_variants(data, sizes, square):
+    """`{width: WebP bytes}` for the `sizes` that don't upscale the image."""
+    image = open_image(data)
+    limit = min(image.size) if square else image.width
+
+    return {width: encode_webp(resize(image, width, square)) for width in sizes if width <= limit}
+
+def generate_variants(url, kind):
+    """
+    Resize the image at `url` and upload its variants. Returns `{width: URL}`,
+    or None if `url` isn't one of our uploads or can't be read as an image.
+    """
+    key = cloudfront_key(url)
+    if not key:
+        return None
+
+    s3_client = get_boto3_client()
+
+    try:
+        response = s3_client.get_object(Bucket=settings.AWS_BUCKET_NAME, Key=key)
+        if response['ContentLength'] > settings.IMAGE_MAX_SOURCE_BYTES:
+            response['Body'].close()
+            raise ValueError(f"Image is too large: {response['ContentLength']} bytes")
+
+        rendered = render_variants(response['Body'].read(), *(
+            (AVATAR_SIZES, True) if kind == 'avatar' else (THUMBNAIL_WIDTHS, False)))
+
+        for width, body in rendered.items():
+            s3_client.put_object(Bucket=settings.AWS_BUCKET_NAME, Key=variant_key(key, width), Body=body,
+                                 ContentType='image/webp', CacheControl=CACHE_CONTROL)
+
+    # UnidentifiedImageError와 잘린 파일 오류는 OSError
+    except (BotoCoreError, ClientError, OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.info("Failed to resize %s %s: %s", kind, url, e)
+        return None
+
+    return {str(width): f'{settings.AWS_CLOUDFRONT_URL}/{variant_key(key, width)}' for width in rendered}
+
+def generate_image_variants(kind, pks):
+    """Create the WebP variants of the `kind` rows `pks`. Returns the number of images resized."""
+    model = IMAGE_MODELS[kind]
+    rows = list(model.objects.filter(pk__in=pks, image_url__isnull=False).values_list('pk', 'image_url'))
+
+    if not rows:
+        return 0
+
+    # 리사이즈와 인코딩은 GIL을 놓으므로 스레드로 나눠 처리하고, 동시에 디코딩하는 이미지 수를 제한
+    with ThreadPoolExecutor(max_workers=settings.IMAGE_RESIZE_WORKERS) as pool:
+        results = list(pool.map(generate_variants, [url for _, url in rows], [kind] * len(rows)))
+
+    resized = []
+    for (pk, url), variants in zip(rows, results):
+        if variants is None:
+            continue
+
+        # 그 사이 이미지가 바뀌었다면 새 이미지의 태스크가 채우므로 방금 만든 변형은 지움
+        if model.objects.filter(pk=pk, image_url=url).update(variants=variants):
+            resized.append(pk)
+        else:
+            queue_s3_deletes(variant_keys(variants))
+
+    # update()는 시그널을 보내지 않으므로 썸네일이 담긴 캐시를 직접 무효화
+    if kind == 'thumbnail' and resized:
+        invalidate_feed_cache()
+        invalidate_collection_share_links(set(LinkCollectionThumbnail.objects
+                                              .filter(pk__in=resized)
+                                              .values_list('collection_id', flat=True)))
+
+    return len(resized)
+
+def enqueue_image_variants(kind, pks):
+    # tasks가 이 모듈을 import하므로 순환 참조를 피해 여기서 import
+    from myapp.tasks import generate_image_variants as generate_image_variants_task
+
+    generate_image_variants_task.apply_async((kind, sorted(pks)), queue=settings.IMAGE_VARIANTS_QUEUE)
+
+def schedule_image_variants(kind, *pks):
+    """Resize the `kind` ('thumbnail' or 'avatar') rows `pks` in the background once the current transaction commits."""
+    if settings.IMAGE_VARIANTS and pks:
+        on_commit_once(f'image-variants:{kind}', partial(enqueue_image_variants, kind), pks)
@@ -0,0 +1,283 @@
+"""
+Page metadata for links (title, og:image, favicon and the URL after redirects),
+fetched once per canonical URL and shared by every link that points to it.
+
+Saving links schedules `tasks.fetch_link_metadata` after commit. The task
+fetches the canonical URLs whose metadata is missing or older than
+LINK_METADATA_TTL_DAYS on a pool of LINK_METADATA_WORKERS threads, each request
+bounded by LINK_METADATA_TIMEOUT and LINK_METADATA_MAX_BYTES. Until then
+`LinkSerializer` renders `metadata` as null.
+
+Only http(s) URLs whose host resolves to public addresses are fetched, checked
+again on every redirect, unless LINK_METADATA_ALLOW_PRIVATE_HOSTS is set. The
+request connects to the checked address rather than resolving the host again.
+"""
+import codecs
+import ipaddress
+import logging
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from html.parser import HTMLParser
+from itertools import islice
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from django.utils import timezone
+
+from myapp.canonical_urls import DEFAULT_PORTS
+from myapp.feed_cache import invalidate_feed_cache
+from myapp.models import CanonicalUrl, Link, LinkMetadata
+from myapp.share_links import invalidate_collection_share_links
+from myapp.utils import get_redis_client, on_commit_once
+
+logger = logging.getLogger(__name__)
+
+MAX_REDIRECTS = 5
+MAX_URL_LENGTH = LinkMetadata._meta.get_field('final_url').max_length
+MAX_TITLE_LENGTH = LinkMetadata._meta.get_field('title').max_length
+READ_CHUNK_SIZE = 8192
+REQUEST_HEADERS = {
+    'User-Agent': 'save-your-links-bot/1.0 (+link preview)',
+    'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.1',
+}
+
+FETCH_CLAIM_KEY = 'link-metadata:fetching:{}'
+FETCH_CLAIM_TTL = 120
+# 다른 태스크가 가져오고 있는 URL의 링크는 이만큼 뒤에 다시 확인
+DEFER_SECONDS = 30
+ENQUEUE_CHUNK_SIZE = 100
+
+
+class UnsafeUrlError(ValueError):
+    pass
+
+
+def check_fetchable(url):
+    """
+    The addresses to connect to for `url`. Raises UnsafeUrlError unless `url`
+    is http(s) and its host resolves only to public addresses.
+    """
+    parts = urlsplit(url)
+
+    if parts.scheme not in DEFAULT_PORTS or not parts.hostname:
+        raise UnsafeUrlError(f"Not an http(s) URL: {url!r}")
+
+    try:
+        addresses = socket.getaddrinfo(parts.hostname, parts.port or DEFAULT_PORTS[parts.scheme],
+                                       type=socket.SOCK_STREAM)
+    except (socket.gaierror, ValueError) as e:
+        raise UnsafeUrlError(f"Cannot resolve {parts.hostname!r}: {e}") from e
+
+    checked = []
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0].split('%')[0])
+        # ::ffff:127.0.0.1 같은 IPv4 매핑 주소는 IPv4 주소로 판단
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+
+        if not address.is_global and not settings.LINK_METADATA_ALLOW_PRIVATE_HOSTS:
+            raise UnsafeUrlError(f"{parts.hostname!r} resolves to a non-public address")
+
+        if address not in checked:
+            checked.append(address)
+
+    return checked
+
+def clean_url(url):
+    """`url` if it is an http(s) URL that fits the column, otherwise ''."""
+    return url if urlsplit(url).scheme in DEFAULT_PORTS and len(url) <= MAX_URL_LENGTH else ''
+
+
+class MetadataParser(HTMLParser):
+    """Collect the title, og:image and icon from a page's <head>; `done` is set once the head is over."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ''
+        self.og_title = ''
+        self.image = ''
+        self.favicon = ''
+        self.in_title = False
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or '' for name, value in attrs}
+
+        if tag == 'title':
+            self.in_title = True
+        elif tag == 'meta':
+            key = (attrs.get('property') or attrs.get('name') or '').lower()
+            if key == 'og:title' and not self.og_title:
+                self.og_title = attrs.get('content', '')
+            elif key in ('og:image', 'og:image:url', 'twitter:image') and not self.image:
+                self.image = attrs.get('content', '').strip()
+        elif tag == 'link':
+            if 'icon' in attrs.get('rel', '').lower().split() and not self.favicon:
+                self.favicon = attrs.get('href', '').strip()
+        elif tag == 'body':
+            self.done = True
+
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self.in_title = False
+        elif tag == 'head':
+            self.done = True
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.title += data
+
+
+def parse_page(url, response, deadline):
+    """Read at most LINK_METADATA_MAX_BYTES of an HTML response, until its <head> ends or `deadline` passes."""
+    fields = {'final_url': url, 'title': '', 'image_url': '', 'favicon_url': urljoin(url, '/favicon.ico')}
+    content_type = response.headers.get('Content-Type', '').lower()
+
+    if not content_type.startswith(('text/html', 'application/xhtml+xml')):
+        return fields
+
+    # charset이 없으면 requests는 ISO-8859-1로 보므로 UTF-8로 읽음
+    try:
+        decoder = codecs.getincrementaldecoder(response.encoding if 'charset' in content_type else 'utf-8')('replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+
+    parser = MetadataParser()
+    received = 0
+
+    for chunk in response.iter_content(READ_CHUNK_SIZE):
+        received += len(chunk)
+        parser.feed(decoder.decode(chunk))
+
+        if parser.done or received >= settings.LINK_METADATA_MAX_BYTES or time.monotonic() > deadline:
+            break
+
+    fields['title'] = ' '.join((parser.og_title or parser.title).split())[:MAX_TITLE_LENGTH]
+    if parser.image:
+        fields['image_url'] = urljoin(url, parser.image)
+    if parser.favicon:
+        fields['favicon_url'] = urljoin(url, parser.favicon)
+
+    return fields
+
+class PinnedHostAdapter(HTTPAdapter):
+    """
+    Transport for URLs rewritten to an address `check_fetchable` returned: TLS
+    still sends SNI for, and verifies the certificate of, the original `hostname`.
+    """
+
+    def __init__(self, hostname):
+        self.hostname = hostname
+        super().__init__()
+
+    def init_poolmanager(self, *args, **kwargs):
+        # http 연결에서는 urllib3가 TLS 전용 인자인 server_hostname을 무시함
+        super().init_poolmanager(*args, server_hostname=self.hostname, **kwargs)
+
+def get_pinned(session, url, addresses, timeout):
+    """
+    GET `url` from one of the checked `addresses`, so a DNS answer that changes
+    after the check (DNS rebinding) can't send the request to another host.
+    """
+    parts = urlsplit(url)
+    headers = {**REQUEST_HEADERS, 'Host': parts.netloc.rpartition('@')[2]}
+
+    for address in addresses:
+        host = f'[{address}]' if address.version == 6 else str(address)
+        netloc = f'{host}:{parts.port}' if parts.port else host
+        session.mount(f'{parts.scheme}://{netloc}/', PinnedHostAdapter(parts.hostname))
+
+        try:
+            return session.get(urlunsplit(parts._replace(netloc=netloc)), headers=headers, timeout=timeout,
+                               stream=True, allow_redirects=False)
+        except requests.ConnectionError:
+            # 연결되지 않으면 requests처럼 다음 주소로 시도
+            if address == addresses[-1]:
+                raise
+
+def fetch_page(url):
+    """Fetch `url`, following redirects by hand so every hop passes `check_fetchable`."""
+    timeout = settings.LINK_METADATA_TIMEOUT
+    # 타임아웃은 소켓 읽기마다 적용되므로 조금씩 보내는 서버를 위해 전체 시간도 제한
+    deadline = time.monotonic() + timeout * 2
+
+    with requests.Session() as session:
+        for _ in range(MAX_REDIRECTS + 1):
+            with get_pinned(session, url, check_fetchable(url), timeout) as response:
+                if response.is_redirect:
+                    url = urljoin(url, response.headers['Location'])
+                    continue
+
+                response.raise_for_status()
+                return parse_page(url, response, deadline)
+
+    raise requests.TooManyRedirects(f"Exceeded {MAX_REDIRECTS} redirects")
+
+def fetch_metadata_fields(url):
+    """LinkMetadata field values for `url`; failures are stored too so the URL isn't retried before the TTL."""
+    try:
+        fields = fetch_page(url)
+    except (requests.RequestException, ValueError) as e:
+        logger.info("Failed to fetch link metadata for %s: %s", url, e)
+        return {'final_url': '', 'title': '', 'image_url': '', 'favicon_url': '', 'failed': True}
+
+    return {**{field: clean_url(fields[field]) for field in ('final_url', 'image_url', 'favicon_url')},
+            'title': fields['title'], 'failed': False}
+
+def claim_fetch(canonical_url_id):
+    return bool(get_redis_client().set(FETCH_CLAIM_KEY.format(canonical_url_id), 1, nx=True, ex=FETCH_CLAIM_TTL))
+
+def fetch_link_metadata(link_ids):
+    """
+    Fetch missing or stale metadata for the canonical URLs of `link_ids`.
+    Returns `(number of URLs fetched, ids of links to retry)`; the retried
+    links have a URL another worker is fetching right now.
+    """
+    stale = dict(CanonicalUrl.objects
+                 .filter(links__pk__in=link_ids)
+                 .exclude(metadata__fetched_at__gte=timezone.now() - timedelta(days=settings.LINK_METADATA_TTL_DAYS))
+                 .distinct()
+                 .values_list('pk', 'url'))
+    claimed = [canonical_url_id for canonical_url_id in stale if claim_fetch(canonical_url_id)]
+    deferred = list(Link.objects
+                    .filter(pk__in=link_ids, canonical_url_id__in=stale.keys() - set(claimed))
+                    .values_list('pk', flat=True))
+
+    if not claimed:
+        return 0, deferred
+
+    with ThreadPoolExecutor(max_workers=settings.LINK_METADATA_WORKERS) as pool:
+        results = pool.map(fetch_metadata_fields, [stale[canonical_url_id] for canonical_url_id in claimed])
+
+        LinkMetadata.objects.bulk_create(
+            [LinkMetadata(canonical_url_id=canonical_url_id, fetched_at=timezone.now(), **fields)
+             for canonical_url_id, fields in zip(claimed, results)],
+            update_conflicts=True,
+            unique_fields=['canonical_url'],
+            update_fields=['final_url', 'title', 'image_url', 'favicon_url', 'failed', 'fetched_at'],
+        )
+
+    # 같은 URL을 가진 다른 사용자의 링크 모음 캐시도 함께 갱신
+    invalidate_feed_cache()
+    invalidate_collection_share_links(set(Link.objects
+                                          .filter(canonical_url_id__in=claimed)
+                                          .values_list('collection_id', flat=True)))
+
+    return len(claimed), deferred
+
+def enqueue_link_metadata(link_ids):
+    # tasks가 이 모듈을 import하므로 순환 참조를 피해 여기서 import
+    from myapp.tasks import fetch_link_metadata as fetch_link_metadata_task
+
+    link_ids = iter(sorted(link_ids))
+    while chunk := list(islice(link_ids, ENQUEUE_CHUNK_SIZE)):
+        fetch_link_metadata_task.delay(chunk)
+
+def schedule_link_metadata(link_ids):
+    """Fetch metadata for `link_ids` in the background once the current transaction commits."""
+    if settings.LINK_METADATA_FETCH and link_ids:
+        on_commit_once('link-metadata', enqueue_link_metadata, link_ids)
@@ -0,0 +1,44 @@
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+
+
+def measure(func, repeat=5):
+    """Run `func` `repeat` times and return the median wall time in milliseconds."""
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(timings)
+
+def percentiles(func, iterations=1000, points=(50, 99)):
+    """Call `func` `iterations` times and return {percentile: milliseconds}."""
+    timings = []
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {point: timings[min(len(timings) - 1, int(len(timings) * point / 100))] for point in points}
+
+def get_bench_user(username):
+    user, _ = User.objects.get_or_create(username=username)
+    return user
+
+@contextmanager
+def disable_auto_now_add(model, field_name='created_at'):
+    """Let bulk seeding write explicit timestamps instead of `now()`."""
+    field = model._meta.get_field(field_name)
+    field.auto_now_add = False
+
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
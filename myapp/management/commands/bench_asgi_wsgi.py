@@ -0,0 +1,146 @@
+import http.client
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.management.commands._bench import get_bench_user
+from myapp.models import Link, LinkCollection
+from myapp.utils import get_redis_client
+
+SERVERS = {
+    'wsgi': ['proj.wsgi:application', '--interface', 'wsgi'],
+    'asgi': ['proj.asgi:application', '--interface', 'asgi3'],
+}
+
+
+class Command(BaseCommand):
+    help = ("Load the hot collection read endpoints on a single uvicorn worker, once with the WSGI "
+            "application and once with the ASGI application and ASYNC_READ_VIEWS, reporting req/s and latency.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--servers', default='wsgi,asgi')
+        parser.add_argument('--concurrency', type=int, default=32, help="Client connections.")
+        parser.add_argument('--duration', type=float, default=10, help="Seconds per endpoint.")
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--collections', type=int, default=200)
+
+    def handle(self, *args, **options):
+        user = get_bench_user('bench-asgi')
+        token = str(uuid.uuid4())
+        collection = self.seed(user, options['collections'])
+        get_redis_client().set(token, user.pk, ex=3600)
+
+        auth = {'Authorization': f'Bearer {token}'}
+        endpoints = [
+            ('feed (anonymous)', '/api/link-collections/owned-or-all/?filter=latest', {}),
+            ('feed', '/api/link-collections/owned-or-all/?filter=latest', auth),
+            ('mine', '/api/link-collections/mine/', auth),
+            ('retrieve', f'/api/link-collections/{collection.pk}/', auth),
+            ('share link', f'/api/link-collections/{collection.share_uuid}/', {}),
+        ]
+
+        self.stdout.write(f"{'server':>6} {'endpoint':>18} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+
+        try:
+            for server in options['servers'].split(','):
+                with self.serve(server, options['port']):
+                    for name, path, headers in endpoints:
+                        rate, p50, p99, errors = self.load(options['port'], path, headers,
+                                                           options['concurrency'], options['duration'])
+                        self.stdout.write(f"{server:>6} {name:>18} {rate:>9.1f} {p50:>8.1f} {p99:>8.1f} {errors:>7}")
+        finally:
+            get_redis_client().delete(token)
+            user.collections.all().delete()
+
+    def seed(self, user, total):
+        user.collections.all().delete()
+        collections = LinkCollection.objects.bulk_create([
+            LinkCollection(title=f'Bench Collection #{i}', owner=user, is_public=True, share_uuid=uuid.uuid4(),
+                           expire_date='2999-01-01T00:00:00Z')
+            for i in range(total)
+        ])
+        Link.objects.bulk_create([
+            Link(title=f'Bench Link #{i}', url=f'https://example.com/{collection.pk}/{i}', collection=collection)
+            for collection in collections
+            for i in range(10)
+        ], batch_size=10_000)
+
+        return collections[0]
+
+    def serve(self, server, port):
+        command = [sys.executable, '-m', 'uvicorn', *SERVERS[server], '--port', str(port),
+                   '--workers', '1', '--no-access-log', '--log-level', 'warning']
+        env = dict(os.environ, ASYNC_READ_VIEWS='1' if server == 'asgi' else '')
+        process = subprocess.Popen(command, env=env)
+
+        for _ in range(100):
+            try:
+                http.client.HTTPConnection('127.0.0.1', port, timeout=1).request('HEAD', '/')
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            process.kill()
+            raise CommandError(f"{server} server did not start on port {port}")
+
+        return ServerProcess(process)
+
+    def load(self, port, path, headers, concurrency, duration):
+        deadline = time.perf_counter() + duration
+        timings = []
+        errors = 0
+        lock = threading.Lock()
+
+        def client():
+            nonlocal errors
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            local_timings, local_errors = [], 0
+
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    connection.request('GET', path, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    if response.status != 200:
+                        local_errors += 1
+                except (OSError, http.client.HTTPException):
+                    local_errors += 1
+                    connection.close()
+                    continue
+
+                local_timings.append((time.perf_counter() - start) * 1000)
+
+            connection.close()
+            with lock:
+                timings.extend(local_timings)
+                errors += local_errors
+
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if not timings:
+            return 0, 0, 0, errors
+
+        timings.sort()
+        return (len(timings) / duration, timings[len(timings) // 2],
+                timings[min(len(timings) - 1, int(len(timings) * 0.99))], errors)
+
+class ServerProcess:
+    def __init__(self, process):
+        self.process = process
+
+    def __enter__(self):
+        return self.process
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        self.process.wait()
@@ -0,0 +1,53 @@
+import tracemalloc
+
+import boto3
+import redis.client
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from myapp.management.commands._bench import measure
+from myapp.utils import get_boto3_client, get_redis_client
+
+
+def fresh_boto3_client():
+    return boto3.client(
+        's3',
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_REGION_NAME,
+    )
+
+def fresh_redis_ping():
+    client = redis.client.StrictRedis(host=settings.REDIS_HOST, password=settings.REDIS_PASS, db=0)
+    client.ping()
+    client.close()
+
+
+class Command(BaseCommand):
+    help = "Per-call cost of building Redis/boto3 clients per call versus the shared client registry."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        key = 'thumbnails/bench.png'
+
+        def presign(client):
+            client.generate_presigned_url('put_object', Params={'Bucket': settings.AWS_BUCKET_NAME, 'Key': key}, ExpiresIn=600)
+
+        rows = [
+            ('boto3 presign, new client', measure(lambda: presign(fresh_boto3_client()), repeat)),
+            ('boto3 presign, registry', measure(lambda: presign(get_boto3_client()), repeat)),
+            ('redis ping, new client', measure(fresh_redis_ping, repeat)),
+            ('redis ping, registry', measure(lambda: get_redis_client().ping(), repeat)),
+        ]
+
+        for label, ms in rows:
+            self.stdout.write(f"{label:<28} {ms:>8.3f} ms/call")
+
+        tracemalloc.start()
+        fresh_boto3_client()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(f"peak allocation for one new boto3 client: {peak / 1024 / 1024:.1f} MB")
@@ -0,0 +1,76 @@
+import io
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from myapp import transfer
+from myapp.management.commands._bench import get_bench_user
+from myapp.models import Link, LinkCollection
+
+
+class Command(BaseCommand):
+    help = "Export and re-import N collections as (gzipped) NDJSON, reporting time and peak Python memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--collections', default='1000,5000,20000')
+        parser.add_argument('--links', type=int, default=20, help="Links per collection.")
+
+    def handle(self, *args, **options):
+        exporter = get_bench_user('bench-export')
+        importer = get_bench_user('bench-import')
+
+        self.stdout.write(f"{'collections':>12} {'mode':>6} {'export ms':>10} {'export peak MB':>15} "
+                          f"{'size MB':>8} {'import ms':>10} {'import peak MB':>15}")
+
+        try:
+            for total in [int(count) for count in options['collections'].split(',')]:
+                self.seed(exporter, total, options['links'])
+
+                for compressed in (False, True):
+                    def export(sink):
+                        lines = transfer.export_collections(exporter)
+                        for chunk in transfer.gzip_stream(lines) if compressed else lines:
+                            sink(chunk)
+
+                    # 측정 중에는 응답 본문을 버리고, 가져오기용 본문은 측정 밖에서 만든다
+                    export_ms, export_peak = self.run(lambda: export(len))
+                    body = io.BytesIO()
+                    export(body.write)
+                    size = body.tell()
+                    body.seek(0)
+
+                    importer.collections.all().delete()
+                    import_ms, import_peak = self.run(
+                        lambda: transfer.import_collections(importer, transfer.open_import_stream(body, compressed))
+                    )
+
+                    self.stdout.write(f"{total:>12} {'gzip' if compressed else 'plain':>6} {export_ms:>10.0f} "
+                                      f"{export_peak:>15.1f} {size / 2 ** 20:>8.1f} {import_ms:>10.0f} {import_peak:>15.1f}")
+        finally:
+            exporter.collections.all().delete()
+            importer.collections.all().delete()
+
+    def run(self, func):
+        tracemalloc.start()
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return elapsed, peak / 2 ** 20
+
+    def seed(self, user, total, links_per_collection, batch_size=1000):
+        existing = user.collections.count()
+
+        for offset in range(existing, total, batch_size):
+            collections = LinkCollection.objects.bulk_create([
+                LinkCollection(title=f'Bench Collection #{i}', description='Lorem ipsum dolor sit amet.', owner=user)
+                for i in range(offset, min(offset + batch_size, total))
+            ])
+            Link.objects.bulk_create([
+                Link(title=f'Bench Link #{i}', url=f'https://example.com/{collection.pk}/{i}', collection=collection)
+                for collection in collections
+                for i in range(links_per_collection)
+            ], batch_size=10_000)
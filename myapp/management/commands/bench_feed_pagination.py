@@ -0,0 +1,94 @@
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from myapp.management.commands._bench import measure, get_bench_user, disable_auto_now_add
+from myapp.models import LinkCollection
+from myapp.paginations import MainPageLinkCollectionPagination, MainPageLinkCollectionCursorPagination
+
+ORDERINGS = {
+    'likes': ('-likes_count', '-created_at'),
+    'views': ('-views_count', '-created_at'),
+    'latest': ('-created_at',),
+}
+
+
+class Command(BaseCommand):
+    help = "Compare page-number and cursor pagination latency on the public feed at increasing page depths."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--collections', type=int, default=1_000_000)
+        parser.add_argument('--page-size', type=int, default=15)
+        parser.add_argument('--depths', default='1,10,100,1000,10000,50000')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--cleanup', action='store_true', help="Delete the seeded collections afterwards.")
+
+    def handle(self, *args, **options):
+        user = get_bench_user('bench-feed')
+        self.seed(user, options['collections'])
+
+        page_size = options['page_size']
+        depths = [int(depth) for depth in options['depths'].split(',')]
+        factory = APIRequestFactory()
+
+        for filter_word, ordering in ORDERINGS.items():
+            qs = LinkCollection.objects.select_related('owner', 'thumbnail').filter(is_public=True).order_by(*ordering)
+            self.stdout.write(f"\nfilter={filter_word} ({', '.join(ordering)})")
+            self.stdout.write(f"{'page':>8} {'page-number ms':>16} {'cursor ms':>12}")
+
+            for depth in depths:
+                page_request = Request(factory.get('/', {'page': depth, 'page_size': page_size}))
+                page_number_ms = measure(
+                    lambda: list(MainPageLinkCollectionPagination().paginate_queryset(qs, page_request)),
+                    options['repeat'],
+                )
+
+                cursor_request = Request(factory.get('/', self.cursor_params(qs, depth, page_size)))
+                cursor_ms = measure(
+                    lambda: MainPageLinkCollectionCursorPagination().paginate_queryset(qs, cursor_request),
+                    options['repeat'],
+                )
+
+                self.stdout.write(f"{depth:>8} {page_number_ms:>16.2f} {cursor_ms:>12.2f}")
+
+        if options['cleanup']:
+            user.collections.all().delete()
+
+    def cursor_params(self, qs, depth, page_size):
+        params = {'pagination': 'cursor', 'page_size': page_size}
+
+        if depth <= 1:
+            return params
+
+        # 이전 페이지의 마지막 행으로 커서를 만든다 (측정 대상 아님)
+        paginator = MainPageLinkCollectionCursorPagination()
+        paginator.ordering = paginator.get_ordering(qs)
+        boundary = qs.order_by(*paginator.ordering)[(depth - 1) * page_size - 1]
+        params['cursor'] = paginator.encode_cursor(boundary)
+
+        return params
+
+    def seed(self, user, total, batch_size=10_000):
+        existing = user.collections.count()
+        now = timezone.now()
+
+        with disable_auto_now_add(LinkCollection):
+            for offset in range(existing, total, batch_size):
+                LinkCollection.objects.bulk_create([
+                    LinkCollection(
+                        title=f'Bench Collection #{i}',
+                        owner=user,
+                        is_public=True,
+                        likes_count=random.randint(0, 10_000),
+                        views_count=random.randint(0, 100_000),
+                        created_at=now - timedelta(seconds=random.randint(0, 365 * 24 * 3600)),
+                    )
+                    for i in range(offset, min(offset + batch_size, total))
+                ])
+                self.stdout.write(f"seeded {min(offset + batch_size, total)}/{total}", ending='\r')
+
+        self.stdout.write(f"{total} collections ready.")
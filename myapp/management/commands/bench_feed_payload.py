@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from myapp.management.commands._bench import measure, get_bench_user
+from myapp.models import Link, LinkCollection
+from myapp.views.collection import LinkCollectionView
+
+
+class Command(BaseCommand):
+    help = "Compare payload size and latency of the compact feed with `expand=links` on the `mine` feed."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--collections', type=int, default=15)
+        parser.add_argument('--links', default='10,100,500')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        user = get_bench_user('bench-feed-payload')
+        view = LinkCollectionView.as_view({'get': 'get_my_collections'})
+        factory = APIRequestFactory()
+
+        self.stdout.write(f"{'links/collection':>16} {'compact KB':>12} {'compact ms':>12} "
+                          f"{'expanded KB':>12} {'expanded ms':>12}")
+
+        try:
+            for links_per_collection in [int(count) for count in options['links'].split(',')]:
+                self.seed(user, options['collections'], links_per_collection)
+                row = []
+
+                for params in ({}, {'expand': 'links'}):
+                    def get_feed():
+                        request = factory.get('/', params)
+                        force_authenticate(request, user=user)
+                        return view(request).render()
+
+                    row.append(len(get_feed().content) / 1024)
+                    row.append(measure(get_feed, options['repeat']))
+
+                self.stdout.write(f"{links_per_collection:>16} {row[0]:>12.1f} {row[1]:>12.2f} "
+                                  f"{row[2]:>12.1f} {row[3]:>12.2f}")
+        finally:
+            user.collections.all().delete()
+
+    def seed(self, user, total, links_per_collection):
+        user.collections.all().delete()
+        collections = LinkCollection.objects.bulk_create([
+            LinkCollection(title=f'Bench Collection #{i}', owner=user) for i in range(total)
+        ])
+
+        Link.objects.bulk_create([
+            Link(title=f'Bench Link #{i}', url=f'https://example.com/articles/{collection.pk}/{i}',
+                 description='Lorem ipsum dolor sit amet, consectetur adipiscing elit.', collection=collection)
+            for collection in collections
+            for i in range(links_per_collection)
+        ], batch_size=10_000)
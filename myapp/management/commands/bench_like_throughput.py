@@ -0,0 +1,75 @@
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.test.utils import override_settings
+
+from myapp.counters import reconcile_like_counts
+from myapp.management.commands._bench import get_bench_user
+from myapp.models import LinkCollection, LinkCollectionLike
+
+
+class Command(BaseCommand):
+    help = ("Like one collection from N concurrent workers and report likes/s with in-row "
+            "counter updates versus buffered Redis counters.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', default='1,2,4,8,16')
+        parser.add_argument('--likes-per-worker', type=int, default=200)
+
+    def handle(self, *args, **options):
+        worker_counts = [int(count) for count in options['workers'].split(',')]
+        likes_per_worker = options['likes_per_worker']
+        owner = get_bench_user('bench-likes')
+        User.objects.bulk_create([
+            User(username=f'bench-liker-{i}') for i in range(max(worker_counts) * likes_per_worker)
+        ], ignore_conflicts=True)
+        liker_ids = list(User.objects.filter(username__startswith='bench-liker-').values_list('pk', flat=True))
+
+        try:
+            self.stdout.write(f"{'workers':>8} {'in-row likes/s':>16} {'buffered likes/s':>18}")
+
+            for workers in worker_counts:
+                rates = [self.run(owner, liker_ids, workers, likes_per_worker, buffered) for buffered in (False, True)]
+                self.stdout.write(f"{workers:>8} {rates[0]:>16.0f} {rates[1]:>18.0f}")
+
+        finally:
+            User.objects.filter(pk__in=liker_ids).delete()
+
+    def run(self, owner, liker_ids, workers, likes_per_worker, buffered):
+        collection = LinkCollection.objects.create(title='Bench Hot Collection', owner=owner, is_public=True)
+        barrier = threading.Barrier(workers + 1)
+
+        def worker(chunk):
+            barrier.wait()
+            try:
+                for liker_id in chunk:
+                    # toggle_like 한 번과 같은 단위: 좋아요 INSERT + 카운터 반영을 한 트랜잭션으로
+                    with transaction.atomic():
+                        LinkCollectionLike.objects.create(collection=collection, liker_id=liker_id)
+            finally:
+                connections.close_all()
+
+        with override_settings(LIKE_COUNTER_BUFFERED=buffered):
+            threads = [
+                threading.Thread(target=worker, args=(liker_ids[i * likes_per_worker:(i + 1) * likes_per_worker],))
+                for i in range(workers)
+            ]
+            for thread in threads:
+                thread.start()
+
+            barrier.wait()
+            start = time.perf_counter()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+            reconcile_like_counts()
+
+        collection.refresh_from_db()
+        assert collection.likes_count == workers * likes_per_worker, collection.likes_count
+        collection.delete()
+
+        return workers * likes_per_worker / elapsed
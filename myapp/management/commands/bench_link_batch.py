@@ -0,0 +1,79 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from myapp.management.commands._bench import get_bench_user
+from myapp.models import Link, LinkCollection
+from myapp.views.link import LinkView
+
+
+class Command(BaseCommand):
+    help = "Sync N links through `links/batch` (add, update, then delete) and compare with per-link deletes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--links', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        total = options['links']
+        user = get_bench_user('bench-link-batch')
+        collection = LinkCollection.objects.create(title='Bench Batch Collection', owner=user)
+        view = LinkView.as_view({'post': 'batch'})
+        factory = APIRequestFactory()
+
+        def batch(payload):
+            request = factory.post('/', payload, format='json')
+            force_authenticate(request, user=user)
+            return view(request)
+
+        try:
+            self.stdout.write(f"{'operation':>18} {'ms':>10} {'queries':>8}")
+
+            response, ms, queries = self.run(lambda: batch({'added': [
+                {'title': f'Bench Link #{i}', 'url': f'https://example.com/{i}', 'collection_id': collection.pk}
+                for i in range(total)
+            ]}))
+            self.stdout.write(f"{'batch add':>18} {ms:>10.1f} {queries:>8}")
+
+            link_ids = [result['id'] for result in response.data['results']['added']]
+            _, ms, queries = self.run(lambda: batch({'updated': [
+                {'id': link_id, 'title': 'Updated', 'url': f'https://example.com/updated/{link_id}'}
+                for link_id in link_ids
+            ]}))
+            self.stdout.write(f"{'batch update':>18} {ms:>10.1f} {queries:>8}")
+
+            _, ms, queries = self.run(lambda: batch({'deleted': [{'id': link_id} for link_id in link_ids]}))
+            self.stdout.write(f"{'batch delete':>18} {ms:>10.1f} {queries:>8}")
+
+            # 이전 구현: 링크마다 get() + delete()
+            links = Link.objects.bulk_create([
+                Link(title=f'Bench Link #{i}', url=f'https://example.com/{i}', collection=collection)
+                for i in range(total)
+            ])
+
+            def delete_one_by_one():
+                with transaction.atomic():
+                    for link in links:
+                        Link.objects.get(pk=link.pk).delete()
+
+            _, ms, queries = self.run(delete_one_by_one)
+            self.stdout.write(f"{'per-link delete':>18} {ms:>10.1f} {queries:>8}")
+
+        finally:
+            collection.delete()
+
+    def run(self, func):
+        queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_queries):
+            start = time.perf_counter()
+            result = func()
+            elapsed = (time.perf_counter() - start) * 1000
+
+        return result, elapsed, queries
@@ -0,0 +1,75 @@
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from myapp.management.commands._bench import measure, get_bench_user
+from myapp.models import LinkCollection
+from myapp.orderings import RELEVANCE_ORDERING
+from myapp.search import refresh_search_vectors, search_collections
+
+WORDS = [
+    '여행', '맛집', '카페', '개발', '디자인', '음악', '영화', '독서', '운동', '요리',
+    '제주', '서울', '부산', '캠핑', '사진', '주식', '부동산', '육아', '게임', '강의',
+    'python', 'django', 'react', 'docker', 'kubernetes', 'travel', 'recipe', 'design',
+    'music', 'startup', 'postgres', 'redis', 'aws', 'career', 'interview', 'tutorial',
+]
+
+
+class Command(BaseCommand):
+    help = "Compare `title__icontains` with the full-text search on the public feed."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--collections', type=int, default=1_000_000)
+        parser.add_argument('--terms', default='여행,맛집 서울,djan,kubernetes tutorial')
+        parser.add_argument('--page-size', type=int, default=15)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--cleanup', action='store_true', help="Delete the seeded collections afterwards.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Full-text search is only indexed on PostgreSQL.")
+
+        user = get_bench_user('bench-search')
+        self.seed(user, options['collections'])
+
+        page_size = options['page_size']
+        qs = LinkCollection.objects.filter(is_public=True)
+
+        self.stdout.write(f"{'term':>24} {'icontains ms':>14} {'full-text ms':>14} {'matches':>10}")
+
+        for term in options['terms'].split(','):
+            icontains_ms = measure(
+                lambda: list(qs.filter(title__icontains=term).order_by('-likes_count', '-created_at')[:page_size]),
+                options['repeat'],
+            )
+            searched = search_collections(qs, term)
+            search_ms = measure(
+                lambda: list(searched.order_by(*RELEVANCE_ORDERING)[:page_size]),
+                options['repeat'],
+            )
+
+            self.stdout.write(f"{term:>24} {icontains_ms:>14.2f} {search_ms:>14.2f} {searched.count():>10}")
+
+        if options['cleanup']:
+            user.collections.all().delete()
+
+    def seed(self, user, total, batch_size=10_000):
+        existing = user.collections.count()
+
+        for offset in range(existing, total, batch_size):
+            collections = LinkCollection.objects.bulk_create([
+                LinkCollection(
+                    title=' '.join(random.sample(WORDS, 3)),
+                    description=' '.join(random.sample(WORDS, 8)),
+                    owner=user,
+                    is_public=True,
+                    likes_count=random.randint(0, 10_000),
+                )
+                for _ in range(offset, min(offset + batch_size, total))
+            ])
+            # bulk_create는 시그널을 보내지 않으므로 검색 벡터를 직접 채운다
+            refresh_search_vectors([collection.pk for collection in collections])
+            self.stdout.write(f"seeded {min(offset + batch_size, total)}/{total}", ending='\r')
+
+        self.stdout.write(f"{total} collections ready.")
@@ -0,0 +1,37 @@
+import uuid
+
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory
+
+from myapp.authentications import UserTokenAuthentication, token_user_cache
+from myapp.management.commands._bench import percentiles, get_bench_user
+from myapp.utils import get_redis_client
+
+
+class Command(BaseCommand):
+    help = "Measure UserTokenAuthentication latency with a cold and a warm token cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        user = get_bench_user('bench-auth')
+        token = str(uuid.uuid4())
+        get_redis_client().set(token, user.pk, ex=600)
+
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        authentication = UserTokenAuthentication()
+
+        def cold():
+            token_user_cache.invalidate(token)
+            authentication.authenticate(request)
+
+        try:
+            for label, func in (('cold (redis + db)', cold), ('warm (in-process)', lambda: authentication.authenticate(request))):
+                result = percentiles(func, options['iterations'])
+                self.stdout.write(f"{label:<20} p50={result[50]:.3f}ms p99={result[99]:.3f}ms")
+
+            self.stdout.write(f"cache stats: {token_user_cache.stats()}")
+
+        finally:
+            get_redis_client().delete(token)
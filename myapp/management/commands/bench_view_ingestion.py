@@ -0,0 +1,61 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from myapp.counters import record_view, flush_pending_views
+from myapp.management.commands._bench import get_bench_user
+from myapp.models import LinkCollection
+from myapp.tasks import save_view_model
+
+
+class Command(BaseCommand):
+    help = ("Replay the same stream of authenticated views through the per-view Celery task "
+            "and through the Redis write-behind buffer, and report broker messages and DB queries.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--views', type=int, default=10_000)
+        parser.add_argument('--collections', type=int, default=100)
+        parser.add_argument('--users', type=int, default=500)
+
+    def handle(self, *args, **options):
+        # 측정이 끝나면 롤백해서 시드 데이터를 남기지 않음
+        with transaction.atomic():
+            owner = get_bench_user('bench-views')
+            collections = LinkCollection.objects.bulk_create([
+                LinkCollection(title=f'Bench View Collection #{i}', owner=owner, is_public=True)
+                for i in range(options['collections'])
+            ])
+            viewers = [get_bench_user(f'bench-viewer-{i}') for i in range(options['users'])]
+            stream = [(random.choice(collections).pk, random.choice(viewers).pk) for _ in range(options['views'])]
+
+            sid = transaction.savepoint()
+            self.report('per-view task', len(stream), lambda: [
+                save_view_model(collection_id=collection_id, user_id=user_id) for collection_id, user_id in stream
+            ])
+            transaction.savepoint_rollback(sid)
+
+            def write_behind():
+                for collection_id, user_id in stream:
+                    record_view(collection_id, user_id)
+                while flush_pending_views():
+                    pass
+
+            self.report('write-behind', 0, write_behind)
+            transaction.set_rollback(True)
+
+    def report(self, label, broker_messages, func):
+        queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(count_queries):
+            func()
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(f"{label:<14} broker messages={broker_messages:<7} db queries={queries:<7} elapsed={elapsed:.2f}s")
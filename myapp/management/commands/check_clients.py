@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.utils import client_registry
+
+
+class Command(BaseCommand):
+    help = "Warm up the shared Redis/boto3 clients and ping them; exits non-zero if any is unhealthy."
+
+    def handle(self, *args, **options):
+        client_registry.warm_up()
+        results = client_registry.health_check()
+
+        for name, healthy in results.items():
+            self.stdout.write(f"{name}: {'ok' if healthy else 'FAILED'}")
+
+        if not all(results.values()):
+            raise CommandError("Unhealthy clients: " + ", ".join(name for name, healthy in results.items() if not healthy))
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+class PostgresOnlyAddIndex(migrations.AddIndex):
+    """
+    AddIndex for PostgreSQL-specific indexes (GIN, BRIN, trigram opclasses).
+
+    The index is always part of the migration state, but it is only created on
+    PostgreSQL so the test suite can still migrate an SQLite database.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
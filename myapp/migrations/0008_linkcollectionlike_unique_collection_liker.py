@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:48
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_likes(apps, schema_editor):
+    # 동시 요청으로 생긴 중복 좋아요를 제거하고, 영향을 받은 링크 모음의 likes_count를 다시 계산
+    LinkCollection = apps.get_model('myapp', 'LinkCollection')
+    LinkCollectionLike = apps.get_model('myapp', 'LinkCollectionLike')
+
+    duplicates = (LinkCollectionLike.objects
+                  .values('collection_id', 'liker_id')
+                  .annotate(rows=Count('id'), keep_id=Min('id'))
+                  .filter(rows__gt=1))
+    collection_ids = set()
+
+    for duplicate in duplicates:
+        (LinkCollectionLike.objects
+         .filter(collection_id=duplicate['collection_id'], liker_id=duplicate['liker_id'])
+         .exclude(id=duplicate['keep_id'])
+         .delete())
+        collection_ids.add(duplicate['collection_id'])
+
+    for collection in LinkCollection.objects.filter(id__in=collection_ids):
+        collection.likes_count = LinkCollectionLike.objects.filter(collection_id=collection.id).count()
+        collection.save(update_fields=['likes_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0007_linkcollection_likes_count_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_likes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='linkcollectionlike',
+            constraint=models.UniqueConstraint(fields=('collection', 'liker'), name='unique_collection_liker'),
+        ),
+    ]
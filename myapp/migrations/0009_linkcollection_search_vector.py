@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:50
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+from myapp.migration_operations import PostgresOnlyAddIndex
+
+
+def backfill_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    from myapp.search import search_vector_expression
+
+    LinkCollection = apps.get_model('myapp', 'LinkCollection')
+    Link = apps.get_model('myapp', 'Link')
+    chunk_size = 5000
+    last_id = 0
+
+    # 큰 테이블을 한 번에 갱신하지 않도록 pk 범위로 나눠서 채움
+    while True:
+        ids = list(LinkCollection.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            break
+
+        LinkCollection.objects.filter(id__in=ids).update(search_vector=search_vector_expression(Link))
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0008_linkcollectionlike_unique_collection_liker'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linkcollection',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='링크 모음 검색 벡터'),
+        ),
+        PostgresOnlyAddIndex(
+            model_name='linkcollection',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='link_collec_search_gin_idx'),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:37
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_link_counts(apps, schema_editor):
+    LinkCollection = apps.get_model('myapp', 'LinkCollection')
+    Link = apps.get_model('myapp', 'Link')
+    links = Link.objects.filter(collection=OuterRef('pk')).order_by().values('collection')
+    chunk_size = 5000
+    last_id = 0
+
+    # 큰 테이블을 한 번에 갱신하지 않도록 pk 범위로 나눠서 채움
+    while True:
+        ids = list(LinkCollection.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            break
+
+        LinkCollection.objects.filter(id__in=ids).update(
+            links_count=Coalesce(Subquery(links.annotate(count=Count('pk')).values('count')), 0),
+            last_link_added_at=Subquery(links.annotate(last=Max('created_at')).values('last')),
+        )
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0009_linkcollection_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linkcollection',
+            name='last_link_added_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='링크 모음 마지막 링크 추가 시각'),
+        ),
+        migrations.AddField(
+            model_name='linkcollection',
+            name='links_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='링크 모음 링크 개수'),
+        ),
+        migrations.RunPython(backfill_link_counts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='linkcollection',
+            index=models.Index(fields=['-links_count', '-created_at'], name='link_collec_links_c_9e7744_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkcollection',
+            index=models.Index(condition=models.Q(('last_link_added_at__isnull', False)), fields=['-last_link_added_at', '-created_at'], name='link_collec_last_link_idx'),
+        ),
+    ]
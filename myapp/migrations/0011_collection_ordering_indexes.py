@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0010_linkcollection_links_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='linkcollection',
+            name='link_collec_created_8d0226_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='linkcollection',
+            name='link_collec_likes_c_e8c226_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='linkcollection',
+            name='link_collec_views_c_6230d0_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='linkcollection',
+            name='link_collec_links_c_9e7744_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='linkcollection',
+            name='link_collec_last_link_idx',
+        ),
+        migrations.AddIndex(
+            model_name='linkcollection',
+            index=models.Index(fields=['-created_at', '-id'], name='link_collec_latest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkcollection',
+            index=models.Index(fields=['-likes_count', '-created_at', '-id'], name='link_collec_likes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkcollection',
+            index=models.Index(fields=['-views_count', '-created_at', '-id'], name='link_collec_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkcollection',
+            index=models.Index(fields=['-links_count', '-created_at', '-id'], name='link_collec_links_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkcollection',
+            index=models.Index(condition=models.Q(('last_link_added_at__isnull', False)), fields=['-last_link_added_at', '-created_at', '-id'], name='link_collec_last_link_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkcollection',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-created_at', '-id'], name='link_collec_public_latest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkcollection',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-likes_count', '-created_at', '-id'], name='link_collec_public_likes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkcollection',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-views_count', '-created_at', '-id'], name='link_collec_public_views_idx'),
+        ),
+    ]
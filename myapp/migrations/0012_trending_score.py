@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:43
+
+import django.db.models.functions.datetime
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0011_collection_ordering_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linkcollection',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False, verbose_name='링크 모음 트렌딩 점수'),
+        ),
+        # 기존 좋아요와 조회는 시각을 알 수 없으므로 NULL로 두고, 이후 추가되는 행에만 DB 기본값을 적용
+        migrations.AddField(
+            model_name='linkcollectionlike',
+            name='created_at',
+            field=models.DateTimeField(null=True, verbose_name='좋아요 시각'),
+        ),
+        migrations.AddField(
+            model_name='linkcollectionviewmodel',
+            name='created_at',
+            field=models.DateTimeField(null=True, verbose_name='조회 시각'),
+        ),
+        migrations.AlterField(
+            model_name='linkcollectionlike',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), null=True, verbose_name='좋아요 시각'),
+        ),
+        migrations.AlterField(
+            model_name='linkcollectionviewmodel',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), null=True, verbose_name='조회 시각'),
+        ),
+        migrations.AddIndex(
+            model_name='linkcollection',
+            index=models.Index(fields=['-trending_score', '-created_at', '-id'], name='link_collec_trending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkcollection',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-trending_score', '-created_at', '-id'], name='link_collec_public_trend_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkcollectionlike',
+            index=models.Index(fields=['created_at'], name='link_collec_created_8cc6cd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkcollectionviewmodel',
+            index=models.Index(fields=['created_at'], name='link_collec_created_2cce9f_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:45
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from myapp.migration_operations import PostgresOnlyAddIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0012_trending_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LinkCollectionViewArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='보관된 조회 수')),
+                ('first_viewed_at', models.DateTimeField(verbose_name='보관된 첫 조회 시각')),
+                ('last_viewed_at', models.DateTimeField(verbose_name='보관된 마지막 조회 시각')),
+                ('collection', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='view_archive', to='myapp.linkcollection', verbose_name='보관된 조회의 링크 모음')),
+            ],
+            options={
+                'verbose_name': '보관된 조회',
+                'verbose_name_plural': '보관된 조회 목록',
+                'db_table': 'link_collection_view_archive',
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='linkcollectionviewmodel',
+            name='link_collec_created_2cce9f_idx',
+        ),
+        PostgresOnlyAddIndex(
+            model_name='linkcollectionviewmodel',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='link_collec_view_created_brin'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0013_view_retention'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LinkCollectionDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='조회 수')),
+                ('likes', models.PositiveIntegerField(default=0, verbose_name='좋아요 수')),
+                ('collection', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='myapp.linkcollection', verbose_name='통계의 링크 모음')),
+            ],
+            options={
+                'verbose_name': '일별 통계',
+                'verbose_name_plural': '일별 통계 목록',
+                'db_table': 'link_collection_daily_stats',
+                'indexes': [models.Index(fields=['date'], name='link_collec_date_e7632c_idx')],
+                'constraints': [models.UniqueConstraint(fields=('collection', 'date'), name='unique_collection_date')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0014_daily_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LinkMetadata',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_hash', models.CharField(max_length=64, unique=True, verbose_name='정규화된 URL의 SHA-256')),
+                ('url', models.URLField(max_length=2048, verbose_name='정규화된 URL')),
+                ('final_url', models.URLField(blank=True, max_length=2048, verbose_name='리다이렉트 후 URL')),
+                ('title', models.CharField(blank=True, max_length=300, verbose_name='페이지 제목')),
+                ('image_url', models.URLField(blank=True, max_length=2048, verbose_name='og:image URL')),
+                ('favicon_url', models.URLField(blank=True, max_length=2048, verbose_name='파비콘 URL')),
+                ('failed', models.BooleanField(default=False, verbose_name='가져오기 실패 여부')),
+                ('fetched_at', models.DateTimeField(verbose_name='가져온 시각')),
+            ],
+            options={
+                'verbose_name': '링크 메타데이터',
+                'verbose_name_plural': '링크 메타데이터 목록',
+                'db_table': 'link_metadata',
+            },
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='metadata',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='links', to='myapp.linkmetadata', verbose_name='링크 메타데이터'),
+        ),
+    ]
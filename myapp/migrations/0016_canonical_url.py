@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0015_link_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CanonicalUrl',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.TextField(verbose_name='정규화된 URL')),
+                ('url_hash', models.CharField(max_length=64, unique=True, verbose_name='정규화된 URL의 SHA-256')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': '정규화된 URL',
+                'verbose_name_plural': '정규화된 URL 목록',
+                'db_table': 'canonical_urls',
+            },
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='canonical_url',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='links', to='myapp.canonicalurl', verbose_name='정규화된 URL'),
+        ),
+        # 기존 메타데이터를 옮긴 다음(0017) NOT NULL로 바꿈(0018)
+        migrations.AddField(
+            model_name='linkmetadata',
+            name='canonical_url',
+            field=models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='metadata', to='myapp.canonicalurl', verbose_name='메타데이터의 URL'),
+        ),
+    ]
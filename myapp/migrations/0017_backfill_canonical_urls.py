@@ -0,0 +1,108 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:02
+
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.db import migrations, transaction
+from django.utils import timezone
+
+CHUNK_SIZE = 2000
+
+# 이후 myapp.canonical_urls의 정규화가 바뀌어도 이 마이그레이션의 결과는 바뀌지 않도록 작성 시점의 구현을 복사
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'gbraid', 'wbraid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+                   '_ga', '_gl'}
+TRACKING_PARAM_PREFIXES = ('utm_',)
+
+
+def is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def normalize_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = parts.hostname
+
+    if scheme not in DEFAULT_PORTS or not host:
+        raise ValueError(f"Not an http(s) URL: {url!r}")
+
+    if ':' in host:
+        host = f'[{host}]'
+
+    port = parts.port
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f'{host}:{port}'
+
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if not is_tracking_param(name)))
+
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+
+def hash_url(normalized_url):
+    return hashlib.sha256(normalized_url.encode()).hexdigest()
+
+
+def get_or_create_canonical_ids(CanonicalUrl, normalized_urls):
+    """`{url_hash: id}` for `{url_hash: normalized url}`."""
+    now = timezone.now()
+    CanonicalUrl.objects.bulk_create(
+        [CanonicalUrl(url=url, url_hash=url_hash, created_at=now) for url_hash, url in normalized_urls.items()],
+        ignore_conflicts=True,
+    )
+    return dict(CanonicalUrl.objects.filter(url_hash__in=normalized_urls).values_list('url_hash', 'id'))
+
+
+def backfill_canonical_urls(apps, schema_editor):
+    CanonicalUrl = apps.get_model('myapp', 'CanonicalUrl')
+    Link = apps.get_model('myapp', 'Link')
+    LinkMetadata = apps.get_model('myapp', 'LinkMetadata')
+
+    # 메타데이터의 url_hash는 같은 정규화로 만든 값이므로 그대로 정규화된 URL 행이 됨
+    with transaction.atomic():
+        metadata = list(LinkMetadata.objects.filter(canonical_url__isnull=True).values_list('id', 'url_hash', 'url'))
+        ids = get_or_create_canonical_ids(CanonicalUrl, {url_hash: url for _, url_hash, url in metadata})
+        LinkMetadata.objects.bulk_update(
+            [LinkMetadata(id=pk, canonical_url_id=ids[url_hash]) for pk, url_hash, _ in metadata],
+            ['canonical_url'], batch_size=CHUNK_SIZE,
+        )
+
+    # 링크 테이블을 오래 잠그지 않도록 pk 범위마다 따로 커밋
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            links = list(Link.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'url')[:CHUNK_SIZE])
+            if not links:
+                break
+
+            hashes = {}
+            normalized_urls = {}
+            for pk, url in links:
+                try:
+                    normalized_url = normalize_url(url)
+                except ValueError:
+                    continue
+
+                hashes[pk] = hash_url(normalized_url)
+                normalized_urls[hashes[pk]] = normalized_url
+
+            ids = get_or_create_canonical_ids(CanonicalUrl, normalized_urls)
+            Link.objects.bulk_update(
+                [Link(id=pk, canonical_url_id=ids[url_hash]) for pk, url_hash in hashes.items()],
+                ['canonical_url'], batch_size=CHUNK_SIZE,
+            )
+            last_id = links[-1][0]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('myapp', '0016_canonical_url'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_canonical_urls, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0017_backfill_canonical_urls'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='linkmetadata',
+            name='canonical_url',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='metadata', to='myapp.canonicalurl', verbose_name='메타데이터의 URL'),
+        ),
+        migrations.RemoveField(
+            model_name='linkmetadata',
+            name='url',
+        ),
+        migrations.RemoveField(
+            model_name='linkmetadata',
+            name='url_hash',
+        ),
+        migrations.RemoveField(
+            model_name='link',
+            name='metadata',
+        ),
+    ]
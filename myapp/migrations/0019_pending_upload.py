@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:04
+
+import django.db.models.deletion
+import django.db.models.functions.datetime
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0018_remove_link_metadata_url'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=1024, unique=True, verbose_name='업로드 S3 키')),
+                ('created_at', models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), verbose_name='업로드 URL 발급 시각')),
+                ('claimed_at', models.DateTimeField(blank=True, null=True, verbose_name='업로드 사용 시각')),
+                ('owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pending_uploads', to=settings.AUTH_USER_MODEL, verbose_name='업로드 URL을 받은 사용자')),
+            ],
+            options={
+                'verbose_name': '업로드 대기',
+                'verbose_name_plural': '업로드 대기 목록',
+                'db_table': 'pending_uploads',
+                'indexes': [models.Index(fields=['created_at'], name='pending_upl_created_7d7ac7_idx')],
+            },
+        ),
+    ]
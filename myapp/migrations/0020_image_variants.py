@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0019_pending_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linkcollectionthumbnail',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='WebP 변형 URL'),
+        ),
+        migrations.AddField(
+            model_name='useravatar',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='WebP 변형 URL'),
+        ),
+    ]
@@ -1,5 +1,9 @@
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Now
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
 
 
@@ -13,11 +17,15 @@ class LinkCollection(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     likes_count = models.PositiveIntegerField(default=0, verbose_name="링크 모음 좋아요 개수")
     views_count = models.PositiveIntegerField(default=0, verbose_name="링크 모음 조회 수")
+    links_count = models.PositiveIntegerField(default=0, verbose_name="링크 모음 링크 개수")
+    last_link_added_at = models.DateTimeField(null=True, blank=True, verbose_name="링크 모음 마지막 링크 추가 시각")
+    trending_score = models.FloatField(default=0, editable=False, verbose_name="링크 모음 트렌딩 점수")
     share_uuid = models.UUIDField(null=True, blank=False, verbose_name="링크 모음 공유 링크 UUID", db_index=True)
     expire_date = models.DateTimeField(null=True, blank=False, verbose_name="링크 모음 공유 링크 만료 기간")
+    search_vector = SearchVectorField(null=True, editable=False, verbose_name="링크 모음 검색 벡터")
 
     def __str__(self):
-        return f"LinkCollection #{self.pk} ({"public" if self.is_public else "private"})\nTitle: {self.title}, Number of links: {len(self.links.all())}"
+        return f"LinkCollection #{self.pk} ({"public" if self.is_public else "private"})\nTitle: {self.title}, Number of links: {self.links_count}"
 
     @property
     def is_expired(self):
@@ -30,16 +38,66 @@ class LinkCollection(models.Model):
         indexes = [
             models.Index(fields=['owner']),
             models.Index(fields=['is_public']),
-            models.Index(fields=['-created_at']),
-            models.Index(fields=['-likes_count']),
-            models.Index(fields=['-views_count'])
+            # myapp.orderings의 정렬 순서와 같은 (정렬 키, created_at, id) 인덱스
+            models.Index(fields=['-created_at', '-id'], name='link_collec_latest_idx'),
+            models.Index(fields=['-likes_count', '-created_at', '-id'], name='link_collec_likes_idx'),
+            models.Index(fields=['-views_count', '-created_at', '-id'], name='link_collec_views_idx'),
+            models.Index(fields=['-links_count', '-created_at', '-id'], name='link_collec_links_idx'),
+            models.Index(fields=['-trending_score', '-created_at', '-id'], name='link_collec_trending_idx'),
+            # 링크가 없는 컬렉션(NULL)은 최근 링크 순 피드에 나오지 않으므로 인덱스에서도 제외
+            models.Index(fields=['-last_link_added_at', '-created_at', '-id'],
+                         condition=Q(last_link_added_at__isnull=False), name='link_collec_last_link_idx'),
+            # 비로그인 피드(is_public=True)용 부분 인덱스
+            models.Index(fields=['-created_at', '-id'], condition=Q(is_public=True), name='link_collec_public_latest_idx'),
+            models.Index(fields=['-likes_count', '-created_at', '-id'], condition=Q(is_public=True),
+                         name='link_collec_public_likes_idx'),
+            models.Index(fields=['-views_count', '-created_at', '-id'], condition=Q(is_public=True),
+                         name='link_collec_public_views_idx'),
+            models.Index(fields=['-trending_score', '-created_at', '-id'], condition=Q(is_public=True),
+                         name='link_collec_public_trend_idx'),
+            GinIndex(fields=['search_vector'], name='link_collec_search_gin_idx'),
         ]
 
+class CanonicalUrl(models.Model):
+    """A normalized URL (`canonical_urls.normalize_url`), shared by every link that points to the same page."""
+    url = models.TextField(verbose_name="정규화된 URL")
+    url_hash = models.CharField(max_length=64, unique=True, verbose_name="정규화된 URL의 SHA-256")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"CanonicalUrl #{self.pk} (URL: {self.url})"
+
+    class Meta:
+        db_table = "canonical_urls"
+        verbose_name = "정규화된 URL"
+        verbose_name_plural = "정규화된 URL 목록"
+
+class LinkMetadata(models.Model):
+    """Page metadata fetched by `link_metadata.fetch_link_metadata` for a canonical URL."""
+    canonical_url = models.OneToOneField(CanonicalUrl, on_delete=models.CASCADE, related_name="metadata", verbose_name="메타데이터의 URL")
+    final_url = models.URLField(max_length=2048, blank=True, verbose_name="리다이렉트 후 URL")
+    title = models.CharField(max_length=300, blank=True, verbose_name="페이지 제목")
+    image_url = models.URLField(max_length=2048, blank=True, verbose_name="og:image URL")
+    favicon_url = models.URLField(max_length=2048, blank=True, verbose_name="파비콘 URL")
+    failed = models.BooleanField(default=False, verbose_name="가져오기 실패 여부")
+    fetched_at = models.DateTimeField(verbose_name="가져온 시각")
+
+    def __str__(self):
+        return f"LinkMetadata #{self.pk} (URL: {self.canonical_url_id}, Title: {self.title})"
+
+    class Meta:
+        db_table = "link_metadata"
+        verbose_name = "링크 메타데이터"
+        verbose_name_plural = "링크 메타데이터 목록"
+
 class Link(models.Model):
     title = models.CharField(max_length=50, blank=False, null=False, verbose_name="링크 제목")
+    # 사용자가 입력한 그대로의 URL (정규화하면 프래그먼트 등이 사라지므로 canonical_url과 별도로 보관)
     url = models.URLField(max_length=256, blank=False, null=False, verbose_name="링크 URL")
     description = models.TextField(blank=True, null=False, verbose_name="링크 설명")
     collection = models.ForeignKey(LinkCollection, on_delete=models.CASCADE, related_name="links", verbose_name="링크가 포함된 컬렉션")
+    canonical_url = models.ForeignKey(CanonicalUrl, on_delete=models.SET_NULL, null=True, blank=True, editable=False,
+                                      related_name="links", verbose_name="정규화된 URL")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -66,18 +124,32 @@ class Bookmark(models.Model):
 class LinkCollectionLike(models.Model):
     collection = models.ForeignKey(LinkCollection, on_delete=models.CASCADE, related_name="likes", verbose_name="좋아요 누른 링크 모음")
     liker = models.ForeignKey(User, on_delete=models.CASCADE, related_name="likes", verbose_name="좋아요 누른 사용자")
+    # 원시 SQL INSERT(reactions.change_like)에도 채워지도록 DB 기본값 사용
+    # 시각을 기록하기 전부터 있던 좋아요는 NULL
+    created_at = models.DateTimeField(db_default=Now(), null=True, verbose_name="좋아요 시각")
 
     def __str__(self):
         return f"LinkCollectionLike #{self.pk} (Collection: {self.collection.pk}, Liker: {self.liker.username})"
 
     class Meta:
         db_table = "link_collection_likes"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['collection', 'liker'],
+                name='unique_collection_liker'
+            )
+        ]
         verbose_name = "좋아요"
         verbose_name_plural = "좋아요 목록"
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
 
 class LinkCollectionViewModel(models.Model):
     collection = models.ForeignKey(LinkCollection, on_delete=models.CASCADE, related_name="views", verbose_name="조회한 링크 모음")
     viewer = models.ForeignKey(User, on_delete=models.CASCADE, related_name="views", verbose_name="조회한 사용자")
+    # 시각을 기록하기 전부터 있던 조회는 NULL
+    created_at = models.DateTimeField(db_default=Now(), null=True, verbose_name="조회 시각")
 
     def __str__(self):
         return f"LinkCollectionViewModel #{self.pk} (Collection: {self.collection.pk}, Viewer: {self.viewer.username})"
@@ -94,12 +166,74 @@ class LinkCollectionViewModel(models.Model):
         verbose_name = "조회"
         verbose_name_plural = "조회 목록"
         indexes = [
-            models.Index(fields=['viewer', 'collection'])
+            models.Index(fields=['viewer', 'collection']),
+            # 행이 시간 순으로만 추가되므로 B-tree 대신 작은 BRIN으로 기간 조회(트렌딩, 보관 기간 정리)
+            BrinIndex(fields=['created_at'], name='link_collec_view_created_brin'),
+        ]
+
+class LinkCollectionViewArchive(models.Model):
+    """View rows older than VIEW_RETENTION_DAYS, folded into one row per collection by `retention.compact_view_events`."""
+    collection = models.OneToOneField(LinkCollection, on_delete=models.CASCADE, related_name="view_archive", verbose_name="보관된 조회의 링크 모음")
+    views = models.PositiveIntegerField(default=0, verbose_name="보관된 조회 수")
+    first_viewed_at = models.DateTimeField(verbose_name="보관된 첫 조회 시각")
+    last_viewed_at = models.DateTimeField(verbose_name="보관된 마지막 조회 시각")
+
+    def __str__(self):
+        return f"LinkCollectionViewArchive #{self.pk} (Collection: {self.collection_id}, Views: {self.views})"
+
+    class Meta:
+        db_table = "link_collection_view_archive"
+        verbose_name = "보관된 조회"
+        verbose_name_plural = "보관된 조회 목록"
+
+class LinkCollectionDailyStats(models.Model):
+    """Views and likes a collection received per day, rolled up by `stats.rollup_daily_stats`."""
+    collection = models.ForeignKey(LinkCollection, on_delete=models.CASCADE, related_name="daily_stats", verbose_name="통계의 링크 모음")
+    date = models.DateField(verbose_name="날짜")
+    views = models.PositiveIntegerField(default=0, verbose_name="조회 수")
+    likes = models.PositiveIntegerField(default=0, verbose_name="좋아요 수")
+
+    def __str__(self):
+        return f"LinkCollectionDailyStats #{self.pk} (Collection: {self.collection_id}, Date: {self.date})"
+
+    class Meta:
+        db_table = "link_collection_daily_stats"
+        constraints = [
+            # 기간 조회(collection_id = ? AND date BETWEEN ? AND ?)도 이 인덱스 하나로 처리
+            models.UniqueConstraint(
+                fields=['collection', 'date'],
+                name='unique_collection_date'
+            )
+        ]
+        verbose_name = "일별 통계"
+        verbose_name_plural = "일별 통계 목록"
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+
+class PendingUpload(models.Model):
+    """An S3 key handed out with a presigned upload URL, claimed once a thumbnail or avatar is saved with it."""
+    key = models.CharField(max_length=1024, unique=True, verbose_name="업로드 S3 키")
+    owner = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="pending_uploads", verbose_name="업로드 URL을 받은 사용자")
+    created_at = models.DateTimeField(db_default=Now(), verbose_name="업로드 URL 발급 시각")
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name="업로드 사용 시각")
+
+    def __str__(self):
+        return f"PendingUpload #{self.pk} (Key: {self.key}, Claimed: {self.claimed_at is not None})"
+
+    class Meta:
+        db_table = "pending_uploads"
+        verbose_name = "업로드 대기"
+        verbose_name_plural = "업로드 대기 목록"
+        indexes = [
+            models.Index(fields=['created_at']),
         ]
 
 class UserAvatar(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="avatar", verbose_name="아바타 소유자")
     image_url = models.URLField(max_length=256, null=True, blank=False, verbose_name="아바타 CloudFront URL")
+    # 가로 폭(px) -> 리사이즈된 WebP의 CloudFront URL, image_variants가 채움
+    variants = models.JSONField(default=dict, blank=True, verbose_name="WebP 변형 URL")
 
     def __str__(self):
         return f"Avatar #{self.pk} (User: {self.user.username}, URL: {self.image_url})"
@@ -112,6 +246,8 @@ class UserAvatar(models.Model):
 class LinkCollectionThumbnail(models.Model):
     collection = models.OneToOneField(LinkCollection, on_delete=models.CASCADE, related_name='thumbnail', verbose_name="썸네일 컬렉션")
     image_url = models.URLField(max_length=256, null=True, blank=False, verbose_name="썸네일 URL")
+    # 가로 폭(px) -> 리사이즈된 WebP의 CloudFront URL, image_variants가 채움
+    variants = models.JSONField(default=dict, blank=True, verbose_name="WebP 변형 URL")
 
     def __str__(self):
         return f"Thumbnail #{self.pk} (Collection: {self.collection.pk}, URL: {self.image_url})"
@@ -0,0 +1,39 @@
+"""
+Sort orders for collection lists, shared by the feeds and the bookmark list.
+
+Every ordering ends with `-pk` so that rows with equal sort keys have a stable
+order, which the cursor paginator relies on. Each one matches a composite index
+on LinkCollection, and a partial `is_public` index for the anonymous feed.
+"""
+from django.db.models import Q
+
+COLLECTION_ORDERINGS = {
+    'latest': ('-created_at', '-pk'),
+    'likes': ('-likes_count', '-created_at', '-pk'),
+    'views': ('-views_count', '-created_at', '-pk'),
+    'links': ('-links_count', '-created_at', '-pk'),
+    'recent_links': ('-last_link_added_at', '-created_at', '-pk'),
+    # `trending_score` is precomputed by `trending.refresh_trending_scores`
+    'trending': ('-trending_score', '-created_at', '-pk'),
+}
+# 정렬 키가 NULL인 행은 제외해서 커서 페이지네이션이 NULL을 비교하지 않도록 함
+ORDERING_FILTERS = {
+    'recent_links': Q(last_link_added_at__isnull=False),
+}
+# `search_rank` is annotated by `search.search_collections`
+RELEVANCE_ORDERING = ('-search_rank', '-likes_count', '-created_at', '-pk')
+DEFAULT_ORDERING = 'latest'
+
+
+def order_collections(queryset, filter_word, search_word=None):
+    """Order `queryset` by `?filter=`; unknown words fall back to the latest first."""
+    if filter_word == 'relevance' and search_word is not None:
+        return queryset.order_by(*RELEVANCE_ORDERING)
+
+    if filter_word not in COLLECTION_ORDERINGS:
+        filter_word = DEFAULT_ORDERING
+
+    if filter_word in ORDERING_FILTERS:
+        queryset = queryset.filter(ORDERING_FILTERS[filter_word])
+
+    return queryset.order_by(*COLLECTION_ORDERINGS[filter_word])
@@ -1,7 +1,213 @@
-from rest_framework.pagination import PageNumberPagination
-
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 class MainPageLinkCollectionPagination(PageNumberPagination):
     page_size = 15
     page_size_query_param = 'page_size'
     max_page_size = 1000
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """`paginate_queryset` for async views, with `acount()` and `async for`."""
+        self.request = request
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        # count는 cached_property이므로 미리 채워두면 Paginator가 동기 쿼리를 하지 않음
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        bottom = (number - 1) * page_size
+        object_list = [obj async for obj in queryset[bottom:bottom + page_size]]
+        self.page = Page(object_list, number, paginator)
+
+        return object_list
+
+class MainPageLinkCollectionCursorPagination(BasePagination):
+    """
+    Keyset pagination over the queryset's own ordering.
+
+    Instead of ``COUNT(*)`` + ``OFFSET``, each page is fetched with a
+    ``WHERE (sort keys) < (last row's sort keys)`` range condition, so the
+    ``-likes_count``/``-views_count``/``-created_at`` indexes are walked from
+    the cursor position and page N costs the same as page 1.
+    The cursor is a signed token carrying the boundary row's sort key values.
+    """
+    page_size = 15
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    cursor_salt = 'myapp.paginations.cursor'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, position, reverse = self.get_page_queryset(queryset, request)
+
+        return self.set_page(list(queryset), position, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """`paginate_queryset` for async views."""
+        queryset, position, reverse = self.get_page_queryset(queryset, request)
+
+        return self.set_page([obj async for obj in queryset], position, reverse)
+
+    def get_page_queryset(self, queryset, request):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        position, reverse = self.decode_cursor(request)
+        ordering = self.ordering if not reverse else [self._invert(field) for field in self.ordering]
+        queryset = queryset.order_by(*ordering)
+
+        if position is not None:
+            queryset = queryset.filter(self.build_keyset_filter(queryset.model, ordering, position))
+
+        # 다음 페이지가 있는지 알기 위해 한 행 더 가져옴
+        return queryset[:self.page_size + 1], position, reverse
+
+    def set_page(self, results, position, reverse):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+
+        return self.page_size
+
+    def get_ordering(self, queryset):
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+
+        # 정렬 키가 같은 행이 있어도 커서가 유일하도록 pk를 마지막 기준으로 추가
+        if not any(field.lstrip('-') in ('pk', 'id') for field in ordering):
+            ordering.append('-pk')
+
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+
+        return self.get_cursor_link(self.encode_cursor(self.page[-1], reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+
+        return self.get_cursor_link(self.encode_cursor(self.page[0], reverse=True))
+
+    def get_cursor_link(self, token):
+        url = remove_query_param(self.base_url, 'page')
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def encode_cursor(self, instance, reverse=False):
+        position = [self._field_value(instance, field) for field in self.ordering]
+        return signing.dumps({'o': self.ordering, 'p': position, 'r': reverse}, salt=self.cursor_salt, compress=True)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+
+        if not token:
+            return None, False
+
+        try:
+            payload = signing.loads(token, salt=self.cursor_salt)
+        except signing.BadSignature:
+            raise NotFound(self.invalid_cursor_message)
+
+        if payload.get('o') != self.ordering or len(payload.get('p', [])) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return payload['p'], bool(payload.get('r'))
+
+    @classmethod
+    def build_keyset_filter(cls, model, ordering, position):
+        """
+        Rows after (va, vb, vpk) in (a DESC, b DESC, pk DESC) order:
+        a <= va AND (a < va OR (a = va AND (b < vb OR (b = vb AND pk < vpk))))
+        The leading `a <= va` is redundant but gives the planner an index range start.
+        """
+        values = [cls._to_python(model, field, value) for field, value in zip(ordering, position)]
+
+        condition = None
+        for field, value in reversed(list(zip(ordering, values))):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            step = Q(**{f'{name}__{lookup}': value})
+
+            if condition is not None:
+                step |= Q(**{name: value}) & condition
+
+            condition = step
+
+        first_field = ordering[0]
+        first_lookup = 'lte' if first_field.startswith('-') else 'gte'
+
+        return Q(**{f'{first_field.lstrip("-")}__{first_lookup}': values[0]}) & condition
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _field_value(instance, field):
+        value = getattr(instance, field.lstrip('-'))
+
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+
+        return value
+
+    @staticmethod
+    def _to_python(model, field, value):
+        name = field.lstrip('-')
+
+        try:
+            model_field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # annotation (예: search_rank)은 JSON 값 그대로 비교
+            return value
+
+        return model_field.to_python(value)
+
+def get_main_page_pagination(request):
+    """
+    Cursor mode is opt-in with `?pagination=cursor` (or any `?cursor=`), page numbers stay the default.
+    """
+    if request.query_params.get('pagination') == 'cursor' or MainPageLinkCollectionCursorPagination.cursor_query_param in request.query_params:
+        return MainPageLinkCollectionCursorPagination()
+
+    return MainPageLinkCollectionPagination()
@@ -0,0 +1,164 @@
+from django.conf import settings
+from django.db import connection, transaction
+
+from myapp.counters import add_like_delta
+from myapp.models import Bookmark, LinkCollection, LinkCollectionLike
+
+TOGGLE = 'toggle'
+ADD = 'add'
+REMOVE = 'remove'
+
+LIKES_TABLE = LinkCollectionLike._meta.db_table
+COLLECTIONS_TABLE = LinkCollection._meta.db_table
+BOOKMARKS_TABLE = Bookmark._meta.db_table
+BOOKMARK_COLLECTIONS_TABLE = Bookmark.collections.through._meta.db_table
+
+
+def _membership_ctes(table, columns, source_sql, source_params, mode):
+    """
+    `deleted` and `inserted` CTEs for the membership row produced by `source_sql`.
+
+    toggle deletes the row and inserts it only if nothing was deleted; add and
+    remove run only one side. Inserts use ON CONFLICT DO NOTHING, so a
+    concurrent duplicate request changes nothing instead of failing.
+    """
+    columns = ', '.join(columns)
+    sql, params = [], []
+
+    if mode == ADD:
+        sql.append('deleted AS (SELECT 1 WHERE false)')
+    else:
+        sql.append(f'deleted AS (DELETE FROM {table} WHERE ({columns}) IN ({source_sql}) RETURNING 1)')
+        params += source_params
+
+    if mode == REMOVE:
+        sql.append('inserted AS (SELECT 1 WHERE false)')
+    else:
+        condition = 'WHERE NOT EXISTS (SELECT 1 FROM deleted)' if mode == TOGGLE else ''
+        sql.append(f'inserted AS (INSERT INTO {table} ({columns}) SELECT * FROM ({source_sql}) AS source {condition} '
+                   f'ON CONFLICT ({columns}) DO NOTHING RETURNING 1)')
+        params += source_params
+
+    return 'WITH ' + ', '.join(sql), params
+
+def _is_member_after(mode, deleted):
+    if mode == TOGGLE:
+        return not deleted
+
+    return mode == ADD
+
+def change_like(collection_id, user_id, mode=TOGGLE):
+    """
+    Like, unlike or toggle in a single round trip. Returns whether the collection is liked afterwards.
+
+    On PostgreSQL the like row and `likes_count` change in one statement, so a
+    double click cannot make the counter drift.
+    """
+    if connection.vendor != 'postgresql':
+        return _change_like_orm(collection_id, user_id, mode)
+
+    ctes, params = _membership_ctes(LIKES_TABLE, ('collection_id', 'liker_id'), 'SELECT %s, %s', [collection_id, user_id], mode)
+    counts = '(SELECT count(*) FROM inserted), (SELECT count(*) FROM deleted)'
+
+    if settings.LIKE_COUNTER_BUFFERED:
+        sql = f'{ctes} SELECT {counts}'
+    else:
+        sql = (f'{ctes} UPDATE {COLLECTIONS_TABLE} '
+               f'SET likes_count = GREATEST(likes_count + (SELECT count(*) FROM inserted) - (SELECT count(*) FROM deleted), 0) '
+               f'WHERE id = %s RETURNING {counts}')
+        params.append(collection_id)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        inserted, deleted = cursor.fetchone() or (0, 0)
+
+    if inserted != deleted and settings.LIKE_COUNTER_BUFFERED:
+        add_like_delta(collection_id, inserted - deleted)
+
+    return _is_member_after(mode, deleted)
+
+def _change_like_orm(collection_id, user_id, mode):
+    # 다른 DB에서는 post_save/post_delete 시그널이 카운터를 갱신함
+    with transaction.atomic():
+        likes = LinkCollectionLike.objects.filter(collection_id=collection_id, liker_id=user_id)
+        deleted = likes.delete()[0] if mode != ADD else 0
+        inserted = 0
+
+        if mode == ADD or (mode == TOGGLE and not deleted):
+            _, inserted = LinkCollectionLike.objects.get_or_create(collection_id=collection_id, liker_id=user_id)
+
+    return _is_member_after(mode, deleted)
+
+def change_bookmark(collection_id, user_id, mode=TOGGLE):
+    """Bookmark, unbookmark or toggle in a single round trip. Returns whether the collection is bookmarked afterwards."""
+    if connection.vendor != 'postgresql':
+        return _change_bookmark_orm(collection_id, user_id, mode)
+
+    ctes, params = _membership_ctes(
+        BOOKMARK_COLLECTIONS_TABLE,
+        ('bookmark_id', 'linkcollection_id'),
+        f'SELECT id, %s FROM {BOOKMARKS_TABLE} WHERE owner_id = %s',
+        [collection_id, user_id],
+        mode,
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'{ctes} SELECT (SELECT count(*) FROM inserted), (SELECT count(*) FROM deleted)', params)
+        inserted, deleted = cursor.fetchone()
+
+    return _is_member_after(mode, deleted)
+
+def _change_bookmark_orm(collection_id, user_id, mode):
+    through = Bookmark.collections.through
+
+    with transaction.atomic():
+        bookmark = Bookmark.objects.get(owner_id=user_id)
+        memberships = through.objects.filter(bookmark=bookmark, linkcollection_id=collection_id)
+        deleted = memberships.delete()[0] if mode != ADD else 0
+        inserted = 0
+
+        if mode == ADD or (mode == TOGGLE and not deleted):
+            _, inserted = through.objects.get_or_create(bookmark=bookmark, linkcollection_id=collection_id)
+
+    return _is_member_after(mode, deleted)
+
+def _membership_querysets(collections, user):
+    collection_ids = [collection.pk for collection in collections]
+    liked = (LinkCollectionLike.objects
+             .filter(liker=user, collection_id__in=collection_ids)
+             .values_list('collection_id', flat=True))
+    bookmarked = (Bookmark.collections.through.objects
+                  .filter(bookmark__owner=user, linkcollection_id__in=collection_ids)
+                  .values_list('linkcollection_id', flat=True))
+
+    return liked, bookmarked
+
+def _set_memberships(collections, liked_ids, bookmarked_ids):
+    for collection in collections:
+        collection.is_liked = collection.pk in liked_ids
+        collection.is_bookmarked = collection.pk in bookmarked_ids
+
+def attach_memberships(collections, user):
+    """
+    Set `is_liked` and `is_bookmarked` on a page of collections for `user`, with
+    one `IN (page ids)` query each. Nothing is attached for anonymous users.
+    """
+    collections = list(collections)
+
+    if not user.is_authenticated or not collections:
+        return collections
+
+    liked, bookmarked = _membership_querysets(collections, user)
+    _set_memberships(collections, set(liked), set(bookmarked))
+
+    return collections
+
+async def aattach_memberships(collections, user):
+    """`attach_memberships` for async views; `collections` must already be evaluated."""
+    if not user.is_authenticated or not collections:
+        return collections
+
+    liked, bookmarked = _membership_querysets(collections, user)
+    _set_memberships(collections, {pk async for pk in liked}, {pk async for pk in bookmarked})
+
+    return collections
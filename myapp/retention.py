@@ -0,0 +1,108 @@
+"""
+Retention for view events.
+
+`link_collection_view` gets one row per (collection, viewer) and is only needed
+in full for recent activity: deduplicating fresh views and the trending score.
+Rows older than VIEW_RETENTION_DAYS are folded into `LinkCollectionViewArchive`
+(one row per collection) and deleted, so the hot table holds a rolling window.
+
+A viewer whose row was compacted counts as a new viewer if they come back, so
+`views_count` counts unique viewers per retention window. Likes are state, not
+events (`is_liked`), and are never compacted. Views from before view times were
+recorded have a NULL `created_at` and are kept, since their age is unknown.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, Min
+from django.utils import timezone
+from redis.exceptions import LockNotOwnedError
+
+from myapp.models import LinkCollectionViewArchive, LinkCollectionViewModel
+from myapp.utils import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+VIEW_COMPACTION_LOCK_KEY = 'views:compaction-lock'
+VIEW_COMPACTION_CHUNK_SIZE = 5000
+
+
+def compact_view_events(now=None, chunk_size=VIEW_COMPACTION_CHUNK_SIZE):
+    """
+    Fold view rows past the retention window into the archive, one transaction
+    per `chunk_size` range of primary keys. Returns the number folded.
+    """
+    lock = get_redis_client().lock(VIEW_COMPACTION_LOCK_KEY, timeout=600)
+    if not lock.acquire(blocking=False):
+        return 0
+
+    try:
+        cutoff = (now or timezone.now()) - timedelta(days=settings.VIEW_RETENTION_DAYS)
+        # 지울 행의 pk 구간을 청크 크기로 나눠 걸으므로 청크마다 pk 인덱스의 한 범위만 읽고 정렬하지 않음
+        bounds = (LinkCollectionViewModel.objects
+                  .filter(created_at__lt=cutoff)
+                  .aggregate(first=Min('pk'), last=Max('pk')))
+        compacted = 0
+
+        if bounds['first'] is None:
+            return 0
+
+        for start_pk in range(bounds['first'] - 1, bounds['last'], chunk_size):
+            compacted += compact_view_chunk(cutoff, start_pk, start_pk + chunk_size)
+
+            # 오래 걸려도 잠금이 만료되어 다른 워커가 같은 행을 접지 않도록 청크마다 연장
+            lock.reacquire()
+
+        return compacted
+
+    except LockNotOwnedError:
+        logger.warning("View compaction lock expired, stopping after %s rows", compacted)
+        return compacted
+
+    finally:
+        try:
+            lock.release()
+        except LockNotOwnedError:
+            pass
+
+@transaction.atomic
+def compact_view_chunk(cutoff, start_pk, end_pk):
+    """Fold the rows past `cutoff` with `start_pk < pk <= end_pk`."""
+    rows = list(LinkCollectionViewModel.objects
+                .filter(pk__gt=start_pk, pk__lte=end_pk, created_at__lt=cutoff)
+                .values_list('pk', 'collection_id', 'created_at'))
+
+    if not rows:
+        return 0
+
+    folded = defaultdict(lambda: [0, None, None])
+    for _, collection_id, created_at in rows:
+        aggregate = folded[collection_id]
+        aggregate[0] += 1
+        aggregate[1] = min(aggregate[1] or created_at, created_at)
+        aggregate[2] = max(aggregate[2] or created_at, created_at)
+
+    archived = set(LinkCollectionViewArchive.objects
+                   .filter(collection_id__in=folded)
+                   .values_list('collection_id', flat=True))
+
+    for collection_id in archived:
+        views, first_viewed_at, last_viewed_at = folded[collection_id]
+        (LinkCollectionViewArchive.objects
+         .filter(collection_id=collection_id)
+         .update(views=F('views') + views, last_viewed_at=last_viewed_at))
+
+    LinkCollectionViewArchive.objects.bulk_create([
+        LinkCollectionViewArchive(collection_id=collection_id, views=views, first_viewed_at=first_viewed_at,
+                                  last_viewed_at=last_viewed_at)
+        for collection_id, (views, first_viewed_at, last_viewed_at) in folded.items()
+        if collection_id not in archived
+    ])
+
+    # post_delete 수신자가 없으므로 시그널 없이 DELETE 한 번으로 지워짐
+    LinkCollectionViewModel.objects.filter(pk__in=[pk for pk, _, _ in rows]).delete()
+
+    return len(rows)
@@ -0,0 +1,131 @@
+"""
+Garbage collection of replaced S3 objects (old avatars and thumbnails).
+
+`schedule_s3_deletes` adds keys to a Redis set once the current transaction
+commits, so a rolled back update never deletes the object it still points to
+and a key queued twice is deleted once. `flush_s3_deletes` (beat, or as soon as
+a full batch is waiting) pops up to S3_DELETE_BATCH_SIZE keys at a time and
+removes them with one `DeleteObjects` request per batch, retrying failed
+requests with exponential backoff. Keys that still fail go back to the set for
+the next flush. Counters are kept in the S3_GC_STATS_KEY hash.
+"""
+import logging
+import time
+
+import redis
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+
+from myapp.utils import get_boto3_client, get_redis_client, on_commit_once
+
+logger = logging.getLogger(__name__)
+
+PENDING_S3_DELETES_KEY = 's3-gc:pending'
+S3_GC_LOCK_KEY = 's3-gc:flush-lock'
+S3_GC_STATS_KEY = 's3-gc:stats'
+# DeleteObjects 요청 하나에 담을 수 있는 최대 키 수
+MAX_DELETE_BATCH_SIZE = 1000
+
+
+def cloudfront_key(url):
+    """S3 key of a CloudFront URL of ours, or None for empty and foreign URLs."""
+    prefix = settings.AWS_CLOUDFRONT_URL + '/'
+
+    if not url or not url.startswith(prefix):
+        return None
+
+    return url[len(prefix):]
+
+def record_stats(client, **counts):
+    pipe = client.pipeline(transaction=False)
+    for name, count in counts.items():
+        if count:
+            pipe.hincrby(S3_GC_STATS_KEY, name, count)
+    pipe.execute()
+
+def queue_s3_deletes(keys):
+    keys = [key for key in keys if key]
+    if not keys:
+        return
+
+    try:
+        client = get_redis_client()
+        client.sadd(PENDING_S3_DELETES_KEY, *keys)
+        pending = client.scard(PENDING_S3_DELETES_KEY)
+    except redis.RedisError as e:
+        # 지우지 못한 객체는 버킷에 남을 뿐이므로 요청은 실패시키지 않음
+        logger.warning("Failed to queue S3 deletes %s: %s", keys, e)
+        return
+
+    if pending >= settings.S3_DELETE_BATCH_SIZE:
+        # tasks가 이 모듈을 import하므로 순환 참조를 피해 여기서 import
+        from myapp.tasks import flush_s3_deletes as flush_s3_deletes_task
+        flush_s3_deletes_task.delay()
+
+def schedule_s3_deletes(*keys):
+    """Delete the S3 objects `keys` in the background once the current transaction commits."""
+    keys = [key for key in keys if key]
+
+    if keys:
+        on_commit_once('s3-deletes', queue_s3_deletes, keys)
+
+def delete_batch(s3_client, keys):
+    """
+    Delete `keys` with one `DeleteObjects` request, retried with backoff.
+    Returns `(keys that failed, number of retries)`.
+    """
+    attempts = settings.S3_DELETE_MAX_ATTEMPTS
+
+    for attempt in range(attempts):
+        try:
+            response = s3_client.delete_objects(
+                Bucket=settings.AWS_BUCKET_NAME,
+                Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True},
+            )
+        except (BotoCoreError, ClientError) as e:
+            if attempt + 1 == attempts:
+                logger.warning("Failed to delete %d S3 objects after %d attempts: %s", len(keys), attempts, e)
+                return keys, attempt
+
+            time.sleep(settings.S3_DELETE_RETRY_BACKOFF * 2 ** attempt)
+            continue
+
+        # Quiet 모드에서는 실패한 키만 응답에 담김
+        errors = response.get('Errors', [])
+        for error in errors:
+            logger.warning("Failed to delete S3 object %s: %s", error.get('Key'), error.get('Code'))
+
+        return [error['Key'] for error in errors], attempt
+
+def flush_s3_deletes():
+    """Delete every queued key, S3_DELETE_BATCH_SIZE per request. Returns the number of objects deleted."""
+    client = get_redis_client()
+    lock = client.lock(S3_GC_LOCK_KEY, timeout=600)
+    if not lock.acquire(blocking=False):
+        return 0
+
+    s3_client = get_boto3_client()
+    batch_size = min(settings.S3_DELETE_BATCH_SIZE, MAX_DELETE_BATCH_SIZE)
+    deleted = 0
+    failed_keys = []
+
+    try:
+        # SPOP으로 꺼낸 키는 다른 워커가 다시 가져가지 않음
+        while keys := [key.decode() for key in client.spop(PENDING_S3_DELETES_KEY, batch_size)]:
+            try:
+                failed, retries = delete_batch(s3_client, keys)
+            except Exception:
+                failed_keys.extend(keys)
+                raise
+
+            failed_keys.extend(failed)
+            deleted += len(keys) - len(failed)
+            record_stats(client, batches=1, deleted=len(keys) - len(failed), failed=len(failed), retries=retries)
+
+    finally:
+        # 실패한 키는 다음 실행에서 다시 시도 (이번 실행에서 다시 꺼내지 않도록 끝난 뒤에 돌려놓음)
+        if failed_keys:
+            client.sadd(PENDING_S3_DELETES_KEY, *failed_keys)
+        lock.release()
+
+    return deleted
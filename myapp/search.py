@@ -0,0 +1,142 @@
+import re
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, F, FloatField, Func, OuterRef, Subquery, TextField, Value, When
+from django.db.models.functions import Cast, Coalesce, Concat
+
+from myapp.models import Link, LinkCollection
+from myapp.utils import on_commit_once
+
+# 한국어 형태소 사전이 없으므로 공백/구두점 단위로만 자르는 simple 설정을 사용하고, 접두사 검색으로 조사를 흡수
+SEARCH_CONFIG = 'simple'
+# ts_rank의 기본 가중치(A=1.0, B=0.4, C=0.2)와 맞춤
+SEARCH_WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2}
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return [token.lower() for token in TOKEN_PATTERN.findall(text or '')]
+
+def search_vector_expression(link_model=Link):
+    """
+    tsvector over the collection title (A), description (B) and its links'
+    titles and URLs (C). URLs are split on punctuation so `example` matches
+    `https://www.example.com/...`.
+    """
+    link_url_words = Func(F('url'), Value(r'[^[:alnum:]]+'), Value(' '), Value('g'),
+                          function='regexp_replace', output_field=TextField())
+    links_text = Subquery(
+        link_model.objects
+        .filter(collection=OuterRef('pk'))
+        .order_by()
+        .values('collection')
+        .annotate(text=StringAgg(Concat('title', Value(' '), link_url_words, output_field=TextField()), delimiter=' '))
+        .values('text')
+    )
+
+    return (SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+            + SearchVector(Coalesce(links_text, Value(''), output_field=TextField()), weight='C', config=SEARCH_CONFIG))
+
+def refresh_search_vectors(collection_ids):
+    if connection.vendor != 'postgresql' or not collection_ids:
+        return
+
+    LinkCollection.objects.filter(pk__in=collection_ids).update(search_vector=search_vector_expression())
+
+def schedule_search_refresh(collection_ids):
+    on_commit_once('search-refresh', refresh_search_vectors, collection_ids)
+
+def build_search_query(search_word):
+    tokens = tokenize(search_word)
+
+    if not tokens:
+        return None
+
+    # 모든 단어가 접두사로 일치해야 함: '여행 맛집' -> '여행:* & 맛집:*'
+    return SearchQuery(' & '.join(f'{token}:*' for token in tokens), search_type='raw', config=SEARCH_CONFIG)
+
+def search_collections(queryset, search_word):
+    """
+    Filter `queryset` to collections whose `search_vector` matches every word
+    of `search_word` as a prefix, annotated with `search_rank`.
+
+    PostgreSQL uses the GIN index on `search_vector`; other databases fall
+    back to `InProcessSearchIndex`. A search without any word matches everything.
+    """
+    if connection.vendor != 'postgresql':
+        return InProcessSearchIndex.build(queryset).search(queryset, search_word)
+
+    query = build_search_query(search_word)
+
+    if query is None:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    # ts_rank는 real을 반환하므로 커서 비교가 정확하도록 double로 변환
+    return (queryset
+            .filter(search_vector=query)
+            .annotate(search_rank=Cast(SearchRank(F('search_vector'), query), FloatField())))
+
+async def asearch_collections(queryset, search_word):
+    """`search_collections` for async views; only the in-process fallback touches the database."""
+    if connection.vendor == 'postgresql':
+        return search_collections(queryset, search_word)
+
+    return await sync_to_async(search_collections)(queryset, search_word)
+
+class InProcessSearchIndex:
+    """
+    Inverted index over the same fields and weights as `search_vector`, built
+    in Python. Used on databases without full-text search (SQLite in tests).
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(lambda: defaultdict(float))
+
+    def add(self, pk, text, weight):
+        for token in tokenize(text):
+            self._postings[token][pk] += SEARCH_WEIGHTS[weight]
+
+    @classmethod
+    def build(cls, queryset):
+        index = cls()
+
+        for pk, title, description in queryset.values_list('pk', 'title', 'description'):
+            index.add(pk, title, 'A')
+            index.add(pk, description, 'B')
+
+        links = Link.objects.filter(collection__in=queryset.values('pk')).values_list('collection_id', 'title', 'url')
+        for collection_id, title, url in links:
+            index.add(collection_id, f'{title} {url}', 'C')
+
+        return index
+
+    def scores(self, search_word):
+        scores = None
+
+        for token in tokenize(search_word):
+            matched = defaultdict(float)
+
+            for indexed_token, postings in self._postings.items():
+                if indexed_token.startswith(token):
+                    for pk, weight in postings.items():
+                        matched[pk] += weight
+
+            scores = matched if scores is None else {pk: score + matched[pk] for pk, score in scores.items() if pk in matched}
+
+        return scores or {}
+
+    def search(self, queryset, search_word):
+        if not tokenize(search_word):
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+        scores = self.scores(search_word)
+        rank = Case(*[When(pk=pk, then=Value(score)) for pk, score in scores.items()],
+                    default=Value(0.0), output_field=FloatField())
+
+        return queryset.filter(pk__in=scores).annotate(search_rank=rank)
@@ -1,6 +1,8 @@
 from .user import UserSerializer, UserAvatarSerializer, UserinfoSerializer
-from .collection import LinkCollectionThumbnailSerializer, LinkCollectionSerializer, LinkCollectionListSerializer
-from .link import LinkSerializer
+from .collection import LinkCollectionThumbnailSerializer, LinkCollectionSerializer, LinkCollectionFeedSerializer, \
+    LinkCollectionListSerializer, LinkCollectionImportSerializer
+from .link import LinkSerializer, LinkMetadataSerializer, LinkPreviewSerializer, LinkBatchItemSerializer, \
+    LinkImportSerializer
 from .bookmark import BookmarkSerializer
 
 __all__ = [
@@ -10,6 +12,12 @@ __all__ = [
     'BookmarkSerializer',
     'LinkCollectionThumbnailSerializer',
     'LinkCollectionSerializer',
+    'LinkCollectionFeedSerializer',
     'LinkCollectionListSerializer',
+    'LinkCollectionImportSerializer',
     'LinkSerializer',
+    'LinkMetadataSerializer',
+    'LinkPreviewSerializer',
+    'LinkBatchItemSerializer',
+    'LinkImportSerializer',
 ]
@@ -1,14 +1,20 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 
-from myapp.models import LinkCollection, LinkCollectionThumbnail
-from .link import LinkSerializer
-from .user import UserSerializer
+from myapp.models import Link, LinkCollection, LinkCollectionThumbnail
+from .link import LinkImportSerializer, LinkPreviewSerializer, LinkSerializer
+from .user import UserSerializer, srcset
 
 
 class LinkCollectionThumbnailSerializer(serializers.ModelSerializer):
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = LinkCollectionThumbnail
-        fields = ('image_url',)
+        fields = ('image_url', 'srcset')
+
+    def get_srcset(self, obj):
+        return srcset(obj.variants)
 
 class LinkCollectionSerializer(serializers.ModelSerializer):
     links = LinkSerializer(many=True, read_only=True)
@@ -21,6 +27,10 @@ class LinkCollectionSerializer(serializers.ModelSerializer):
     active_share_link = serializers.SerializerMethodField()
     thumbnail_image_url = serializers.URLField(write_only=True, required=False, allow_null=True)
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.prefetch_related(Prefetch('links', queryset=Link.objects.select_related('canonical_url__metadata')))
+
     def get_active_share_link(self, obj):
         if obj.share_uuid is not None and not obj.is_expired:
             return f"http://localhost:8080/collections/{obj.share_uuid}"
@@ -30,15 +40,48 @@ class LinkCollectionSerializer(serializers.ModelSerializer):
     class Meta:
         model = LinkCollection
         fields = ('id', 'title', 'owner', 'description', 'is_public', 'created_at', 'updated_at', 'links',
-                  'is_bookmarked', 'is_liked', 'total_likes', 'view_counts', 'active_share_link', 'expire_date',
-                  'thumbnail', 'thumbnail_image_url')
-        read_only_fields = ('created_at', 'updated_at', 'total_likes', 'view_counts')
+                  'is_bookmarked', 'is_liked', 'total_likes', 'view_counts', 'links_count', 'last_link_added_at',
+                  'active_share_link', 'expire_date', 'thumbnail', 'thumbnail_image_url')
+        read_only_fields = ('created_at', 'updated_at', 'total_likes', 'view_counts', 'links_count', 'last_link_added_at')
+
+class LinkCollectionFeedSerializer(LinkCollectionSerializer):
+    """
+    Feed representation: the first `PREVIEW_SIZE` links and a link count
+    instead of every link. Querysets must go through `setup_eager_loading`.
+    """
+    PREVIEW_SIZE = 3
+
+    links = None
+    link_previews = LinkPreviewSerializer(source='preview_links', many=True, read_only=True)
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        # 슬라이스된 Prefetch는 ROW_NUMBER() 윈도 함수로 컬렉션마다 앞의 N개만 가져옴
+        previews = Link.objects.order_by('pk')[:cls.PREVIEW_SIZE]
+
+        return queryset.prefetch_related(Prefetch('links', queryset=previews, to_attr='preview_links'))
+
+    class Meta(LinkCollectionSerializer.Meta):
+        fields = ('id', 'title', 'owner', 'description', 'is_public', 'created_at', 'updated_at', 'links_count',
+                  'last_link_added_at', 'link_previews', 'is_bookmarked', 'is_liked', 'total_likes', 'view_counts',
+                  'active_share_link', 'expire_date', 'thumbnail')
 
 class LinkCollectionListSerializer(serializers.ModelSerializer):
     owner = UserSerializer(read_only=True)
     thumbnail = LinkCollectionThumbnailSerializer(read_only=True)
+    is_bookmarked = serializers.BooleanField(read_only=True)
+    is_liked = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = LinkCollection
-        fields = ('id', 'title', 'owner', 'description', 'is_public', 'thumbnail')
+        fields = ('id', 'title', 'owner', 'description', 'is_public', 'thumbnail', 'is_bookmarked', 'is_liked')
         read_only_fields = ('created_at', 'updated_at',)
+
+class LinkCollectionImportSerializer(serializers.ModelSerializer):
+    """One NDJSON line of a collection import; `created_at` and ids in exports are ignored."""
+    links = LinkImportSerializer(many=True, required=False)
+    thumbnail_image_url = serializers.URLField(required=False, allow_null=True, max_length=256)
+
+    class Meta:
+        model = LinkCollection
+        fields = ('title', 'description', 'is_public', 'thumbnail_image_url', 'links')
@@ -1,10 +1,44 @@
 from rest_framework import serializers
 
-from myapp.models import Link
+from myapp.models import Link, LinkMetadata
 
 
+class LinkMetadataSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LinkMetadata
+        fields = ('final_url', 'title', 'image_url', 'favicon_url')
+
+    def to_representation(self, instance):
+        # 가져오기에 실패한 URL은 아직 가져오지 않은 URL처럼 null
+        if instance.failed:
+            return None
+
+        return super().to_representation(instance)
+
 class LinkSerializer(serializers.ModelSerializer):
+    """A link with its fetched page `metadata`; querysets should `select_related('canonical_url__metadata')`."""
+    metadata = LinkMetadataSerializer(source='canonical_url.metadata', read_only=True, allow_null=True)
+
     class Meta:
         model = Link
-        fields = '__all__'
+        exclude = ('canonical_url',)
         read_only_fields = ('created_at', 'updated_at')
+
+class LinkPreviewSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Link
+        fields = ('id', 'title', 'url')
+
+class LinkBatchItemSerializer(serializers.ModelSerializer):
+    """One entry of `links/batch`; only validates fields, ownership is checked by the view."""
+    id = serializers.IntegerField(required=False)
+    collection_id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = Link
+        fields = ('id', 'collection_id', 'title', 'url', 'description')
+
+class LinkImportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Link
+        fields = ('title', 'url', 'description')
@@ -4,6 +4,11 @@ from rest_framework import serializers
 from myapp.models import UserAvatar
 
 
+def srcset(variants):
+    """`srcset` attribute for the `variants` of a thumbnail or avatar (see myapp.image_variants)."""
+    widths = sorted((variants or {}), key=int)
+    return ', '.join(f'{variants[width]} {width}w' for width in widths)
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -11,9 +16,14 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ('is_staff',)
 
 class UserAvatarSerializer(serializers.ModelSerializer):
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = UserAvatar
-        fields = ('image_url',)
+        fields = ('image_url', 'srcset')
+
+    def get_srcset(self, obj):
+        return srcset(obj.variants)
 
 class UserinfoSerializer(serializers.ModelSerializer):
     avatar = UserAvatarSerializer(read_only=True)
@@ -0,0 +1,144 @@
+import logging
+import math
+
+import redis
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from myapp.models import LinkCollection
+from myapp.serializers import LinkCollectionSerializer
+from myapp.utils import get_async_redis_client, get_redis_client, json_response, on_commit_once
+
+logger = logging.getLogger(__name__)
+
+SHARE_LINK_KEY = 'share-link:{}'
+INVALID_LINK_MESSAGE = "잘못된 링크입니다."
+EXPIRED_LINK_MESSAGE = "링크가 만료되었거나 잘못된 링크입니다."
+
+
+def share_link_queryset():
+    return LinkCollectionSerializer.setup_eager_loading(LinkCollection.objects.select_related('owner', 'thumbnail'))
+
+def render_share_link(collection, share_uuid):
+    """Return `(status, payload, ttl)` for a share link lookup; `collection` is None for unknown links."""
+    if collection is None:
+        return status.HTTP_404_NOT_FOUND, {"error": INVALID_LINK_MESSAGE}, settings.SHARE_LINK_NEGATIVE_CACHE_TTL
+
+    if collection.is_expired or str(collection.share_uuid) != share_uuid:
+        return status.HTTP_404_NOT_FOUND, {"error": EXPIRED_LINK_MESSAGE}, settings.SHARE_LINK_NEGATIVE_CACHE_TTL
+
+    # 만료 시각이 지나면 캐시도 함께 사라지도록 TTL을 남은 시간으로 제한
+    ttl = min(settings.SHARE_LINK_CACHE_TTL, math.ceil((collection.expire_date - timezone.now()).total_seconds()))
+    return status.HTTP_200_OK, LinkCollectionSerializer(collection).data, ttl
+
+def resolve_share_link(share_uuid):
+    try:
+        collection = share_link_queryset().get(share_uuid=share_uuid)
+    except (LinkCollection.DoesNotExist, ValidationError):
+        collection = None
+
+    return render_share_link(collection, share_uuid)
+
+async def aresolve_share_link(share_uuid):
+    try:
+        collection = await share_link_queryset().aget(share_uuid=share_uuid)
+    except (LinkCollection.DoesNotExist, ValidationError):
+        collection = None
+
+    return render_share_link(collection, share_uuid)
+
+def build_share_link_entry(status_code, data):
+    return str(status_code).encode() + b'\n' + JSONRenderer().render(data)
+
+def share_link_response(entry):
+    status_code, payload = entry.split(b'\n', 1)
+    return HttpResponse(payload, content_type='application/json', status=int(status_code))
+
+def uncached_share_link_response(status_code, data, ttl):
+    return json_response(data, status=status_code)
+
+def cached_share_link_response(share_uuid):
+    """
+    Serve a share link from its pre-rendered JSON in Redis, resolving it from
+    the database on a miss. Unknown and expired links are cached too, for
+    SHARE_LINK_NEGATIVE_CACHE_TTL, so scans over random UUIDs stay in Redis.
+    """
+    if not settings.SHARE_LINK_CACHE:
+        return uncached_share_link_response(*resolve_share_link(share_uuid))
+
+    key = SHARE_LINK_KEY.format(share_uuid)
+
+    try:
+        client = get_redis_client()
+        entry = client.get(key)
+    except redis.RedisError as e:
+        logger.warning("Failed to read share link cache: %s", e)
+        return uncached_share_link_response(*resolve_share_link(share_uuid))
+
+    if entry is None:
+        status_code, data, ttl = resolve_share_link(share_uuid)
+        entry = build_share_link_entry(status_code, data)
+
+        try:
+            client.set(key, entry, ex=ttl)
+        except redis.RedisError as e:
+            logger.warning("Failed to write share link cache: %s", e)
+
+    return share_link_response(entry)
+
+async def acached_share_link_response(share_uuid):
+    """`cached_share_link_response` for async views."""
+    if not settings.SHARE_LINK_CACHE:
+        return uncached_share_link_response(*await aresolve_share_link(share_uuid))
+
+    key = SHARE_LINK_KEY.format(share_uuid)
+
+    try:
+        client = get_async_redis_client()
+        entry = await client.get(key)
+    except redis.RedisError as e:
+        logger.warning("Failed to read share link cache: %s", e)
+        return uncached_share_link_response(*await aresolve_share_link(share_uuid))
+
+    if entry is None:
+        status_code, data, ttl = await aresolve_share_link(share_uuid)
+        entry = build_share_link_entry(status_code, data)
+
+        try:
+            await client.set(key, entry, ex=ttl)
+        except redis.RedisError as e:
+            logger.warning("Failed to write share link cache: %s", e)
+
+    return share_link_response(entry)
+
+def delete_share_link_entries(share_uuids):
+    if not share_uuids:
+        return
+
+    try:
+        get_redis_client().delete(*[SHARE_LINK_KEY.format(share_uuid) for share_uuid in share_uuids])
+    except redis.RedisError as e:
+        logger.warning("Failed to invalidate share link cache: %s", e)
+
+def delete_collection_share_link_entries(collection_ids):
+    delete_share_link_entries(list(
+        LinkCollection.objects
+        .filter(pk__in=collection_ids, share_uuid__isnull=False)
+        .values_list('share_uuid', flat=True)
+    ))
+
+def invalidate_share_links(*share_uuids):
+    """Drop the cached share links once the current transaction commits."""
+    share_uuids = [share_uuid for share_uuid in share_uuids if share_uuid is not None]
+
+    if settings.SHARE_LINK_CACHE and share_uuids:
+        on_commit_once('share-link-invalidation', delete_share_link_entries, share_uuids)
+
+def invalidate_collection_share_links(collection_ids):
+    """Drop the cached share links of `collection_ids`, looked up in one query after commit."""
+    if settings.SHARE_LINK_CACHE and collection_ids:
+        on_commit_once('share-link-collection-invalidation', delete_collection_share_link_entries, collection_ids)
@@ -1,10 +1,16 @@
 from django.contrib.auth.models import User
 from django.db.models import F
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 
+from myapp.canonical_urls import assign_canonical_urls
+from myapp.counters import add_like_delta, add_links, remove_links
+from myapp.feed_cache import invalidate_feed_cache
+from myapp.link_metadata import schedule_link_metadata
 from myapp.models import Bookmark, UserAvatar, LinkCollection, LinkCollectionThumbnail, LinkCollectionLike, \
-    LinkCollectionViewModel
+    LinkCollectionViewModel, Link
+from myapp.search import schedule_search_refresh
+from myapp.share_links import invalidate_collection_share_links, invalidate_share_links
 
 
 @receiver(post_save, sender=User)
@@ -25,16 +31,77 @@ def create_link_collection_thumbnail(sender, instance, created, **kwargs):
 @receiver(post_save, sender=LinkCollectionLike)
 def increment_like_count(sender, instance, created, **kwargs):
     if created:
-        instance.collection.likes_count = F('likes_count') + 1
-        instance.collection.save(update_fields=['likes_count'])
+        add_like_delta(instance.collection_id, 1)
 
 @receiver(post_delete, sender=LinkCollectionLike)
 def decrement_like_count(sender, instance, **kwargs):
-    instance.collection.likes_count = F('likes_count') - 1
-    instance.collection.save(update_fields=['likes_count'])
+    add_like_delta(instance.collection_id, -1)
+
+@receiver(post_save, sender=Link)
+def increment_link_count(sender, instance, created, **kwargs):
+    if created:
+        add_links([instance])
+
+@receiver(post_delete, sender=Link)
+def decrement_link_count(sender, instance, origin=None, **kwargs):
+    # 컬렉션/사용자 삭제에 딸려 지워지는 링크는 셀 필요가 없고, queryset 삭제(batch)는 호출한 쪽에서 셈
+    if origin is instance:
+        remove_links({instance.collection_id: 1})
+
+@receiver(pre_save, sender=Link)
+def assign_link_canonical_url(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'url' not in update_fields:
+        return
+
+    assign_canonical_urls([instance])
+
+@receiver(post_save, sender=Link)
+def fetch_saved_link_metadata(sender, instance, **kwargs):
+    # URL이 바뀌지 않았으면 태스크가 기존 메타데이터를 그대로 둠
+    schedule_link_metadata([instance.pk])
 
 @receiver(post_save, sender=LinkCollectionViewModel)
 def increment_view_count(sender, instance, created, **kwargs):
     if created:
         instance.collection.views_count = F('views_count') + 1
         instance.collection.save(update_fields=['views_count'])
+
+@receiver(post_save, sender=LinkCollection)
+def refresh_collection_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'title', 'description'} & set(update_fields):
+        return
+
+    schedule_search_refresh([instance.pk])
+
+@receiver(post_save, sender=Link)
+@receiver(post_delete, sender=Link)
+def refresh_link_collection_search_vector(sender, instance, **kwargs):
+    schedule_search_refresh([instance.collection_id])
+
+@receiver(post_save, sender=LinkCollection)
+@receiver(post_delete, sender=LinkCollection)
+@receiver(post_save, sender=LinkCollectionThumbnail)
+@receiver(post_save, sender=Link)
+@receiver(post_delete, sender=Link)
+def invalidate_public_feed(sender, **kwargs):
+    invalidate_feed_cache()
+
+@receiver(post_save, sender=LinkCollection)
+@receiver(post_delete, sender=LinkCollection)
+def invalidate_collection_share_link(sender, instance, **kwargs):
+    invalidate_share_links(instance.share_uuid)
+
+@receiver(post_save, sender=LinkCollectionThumbnail)
+@receiver(post_save, sender=Link)
+@receiver(post_delete, sender=Link)
+def invalidate_parent_share_link(sender, instance, **kwargs):
+    # 링크 인스턴스에는 share_uuid가 없으므로 커밋 후 한 번에 조회
+    invalidate_collection_share_links([instance.collection_id])
+
+@receiver(post_save, sender=User)
+def invalidate_public_feed_on_owner_change(sender, instance, update_fields=None, **kwargs):
+    # 로그인 시 last_login만 갱신되는 저장은 피드 내용과 무관
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+
+    invalidate_feed_cache()
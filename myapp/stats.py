@@ -0,0 +1,145 @@
+"""
+Daily views and likes per collection for the owner's `stats` endpoint.
+
+`rollup_daily_stats` rebuilds the `LinkCollectionDailyStats` rows from the last
+rolled-up day on from the view and like rows, so a day keeps being corrected
+until it is over and running it twice gives the same rows. Where to start is
+read from the rollups themselves, and days whose views may already have been
+compacted (VIEW_RETENTION_DAYS) are never rebuilt. The endpoint only reads the
+rollups, so its numbers lag the events by up to STATS_ROLLUP_INTERVAL.
+
+Likes are counted by the day they were made, among the likes that still exist:
+an unlike removes the like from its day on the next rollup of that day.
+"""
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from myapp.models import LinkCollectionDailyStats, LinkCollectionLike, LinkCollectionViewModel
+from myapp.utils import get_redis_client
+
+STATS_LOCK_KEY = 'stats:rollup-lock'
+# 트랜잭션이 늦게 커밋되어 마지막 집계일 이전 시각으로 들어온 활동도 다시 보도록 겹쳐서 조회
+STATS_OVERLAP = timedelta(minutes=5)
+STATS_BATCH_SIZE = 1000
+STATS_DEFAULT_DAYS = 30
+STATS_MAX_DAYS = 366
+
+# (model, LinkCollectionDailyStats field)
+STATS_EVENTS = (
+    (LinkCollectionViewModel, 'views'),
+    (LinkCollectionLike, 'likes'),
+)
+
+
+def count_events_per_day(since):
+    """`{(collection_id, date): {field: count}}` for events on or after the start of `since`'s day."""
+    counts = defaultdict(dict)
+
+    for model, field in STATS_EVENTS:
+        # 시각이 기록되기 전의 활동(NULL)은 날짜를 알 수 없으므로 제외
+        events = model.objects.filter(created_at__isnull=False)
+        if since is not None:
+            events = events.filter(created_at__gte=since)
+
+        # 날짜는 TIME_ZONE(Asia/Seoul) 기준으로 자름
+        rows = (events
+                .annotate(date=TruncDate('created_at'))
+                .values('collection_id', 'date')
+                .annotate(count=Count('pk'))
+                .values_list('collection_id', 'date', 'count'))
+
+        for collection_id, day, count in rows.iterator():
+            counts[(collection_id, day)][field] = count
+
+    return counts
+
+@transaction.atomic
+def replace_daily_stats(since_date, counts):
+    # since_date 이후의 날짜는 통째로 다시 씀 (좋아요가 모두 취소된 날도 남지 않도록)
+    stale = LinkCollectionDailyStats.objects.all()
+    if since_date is not None:
+        stale = stale.filter(date__gte=since_date)
+    stale.delete()
+
+    LinkCollectionDailyStats.objects.bulk_create(
+        [LinkCollectionDailyStats(collection_id=collection_id, date=day, **fields)
+         for (collection_id, day), fields in counts.items()],
+        batch_size=STATS_BATCH_SIZE,
+    )
+
+def rollup_start_date(now):
+    """First day to rebuild, or None on the first run (no rollups yet)."""
+    last_date = LinkCollectionDailyStats.objects.aggregate(last_date=Max('date'))['last_date']
+    if last_date is None:
+        return None
+
+    since_date = timezone.localdate(timezone.make_aware(datetime.combine(last_date, time.min)) - STATS_OVERLAP)
+
+    # 보관 기간이 지나 조회 행이 지워졌을 수 있는 날은 다시 계산하면 줄어드므로 그대로 둠
+    retained_date = timezone.localdate(now - timedelta(days=settings.VIEW_RETENTION_DAYS)) + timedelta(days=1)
+
+    return max(since_date, retained_date)
+
+def rollup_daily_stats(now=None):
+    """Rebuild the daily rollups from the last rolled-up day on. Returns the number of rows written."""
+    lock = get_redis_client().lock(STATS_LOCK_KEY, timeout=600)
+    if not lock.acquire(blocking=False):
+        return 0
+
+    try:
+        since_date = rollup_start_date(now or timezone.now())
+
+        # 첫 실행은 남아있는 모든 활동으로 채움
+        since = None
+        if since_date is not None:
+            since = timezone.make_aware(datetime.combine(since_date, time.min))
+
+        counts = count_events_per_day(since)
+        replace_daily_stats(since_date, counts)
+
+        return len(counts)
+
+    finally:
+        lock.release()
+
+def parse_date_range(params):
+    """
+    `(start, end)` from the `?start=` and `?end=` ISO dates, both inclusive,
+    defaulting to the last STATS_DEFAULT_DAYS days. Raises ValueError.
+    """
+    try:
+        end = date.fromisoformat(params['end']) if params.get('end') else timezone.localdate()
+        start = (date.fromisoformat(params['start']) if params.get('start')
+                 else end - timedelta(days=STATS_DEFAULT_DAYS - 1))
+    except ValueError:
+        raise ValueError("날짜는 YYYY-MM-DD 형식이어야 합니다.") from None
+
+    if start > end:
+        raise ValueError("시작일은 종료일보다 늦을 수 없습니다.")
+
+    if (end - start).days >= STATS_MAX_DAYS:
+        raise ValueError(f"조회 기간은 {STATS_MAX_DAYS}일을 넘을 수 없습니다.")
+
+    return start, end
+
+def daily_series(collection_id, start, end):
+    """One entry per day from `start` to `end`, with zeros for days without activity."""
+    rows = {day: (views, likes) for day, views, likes in (
+        LinkCollectionDailyStats.objects
+        .filter(collection_id=collection_id, date__range=(start, end))
+        .values_list('date', 'views', 'likes')
+    )}
+
+    series = []
+    for offset in range((end - start).days + 1):
+        day = start + timedelta(days=offset)
+        views, likes = rows.get(day, (0, 0))
+        series.append({'date': day.isoformat(), 'views': views, 'likes': likes})
+
+    return series
@@ -1,10 +1,55 @@
 from celery import shared_task
-from django.conf import settings
 
+from myapp import counters, image_variants, link_metadata, retention, s3_gc, stats, trending, uploads
 from myapp.models import LinkCollectionViewModel, User
-from myapp.utils import get_boto3_client
 
 
+@shared_task
+def flush_pending_views():
+    return counters.flush_pending_views()
+
+@shared_task
+def reconcile_like_counts():
+    return counters.reconcile_like_counts()
+
+@shared_task
+def reconcile_link_counts():
+    return counters.reconcile_link_counts()
+
+@shared_task
+def refresh_trending_scores():
+    return trending.refresh_trending_scores()
+
+@shared_task
+def compact_view_events():
+    return retention.compact_view_events()
+
+@shared_task
+def rollup_daily_stats():
+    return stats.rollup_daily_stats()
+
+@shared_task
+def fetch_link_metadata(link_ids):
+    fetched, deferred = link_metadata.fetch_link_metadata(link_ids)
+
+    if deferred:
+        fetch_link_metadata.apply_async((deferred,), countdown=link_metadata.DEFER_SECONDS)
+
+    return fetched
+
+@shared_task
+def generate_image_variants(kind, pks):
+    return image_variants.generate_image_variants(kind, pks)
+
+@shared_task
+def flush_s3_deletes():
+    return s3_gc.flush_s3_deletes()
+
+@shared_task
+def sweep_orphaned_uploads():
+    return uploads.sweep_orphaned_uploads()
+
+# retrieve는 더 이상 이 태스크를 보내지 않음 (배포 시점에 큐에 남아있는 메시지 처리용)
 @shared_task
 def save_view_model(collection_id, user_id):
     if LinkCollectionViewModel.objects.filter(collection_id=collection_id, viewer_id=user_id).exists():
@@ -12,14 +57,7 @@ def save_view_model(collection_id, user_id):
 
     LinkCollectionViewModel.objects.create(collection_id=collection_id, viewer_id=user_id)
 
+# 뷰는 더 이상 이 태스크를 보내지 않음 (배포 시점에 큐에 남아있는 메시지 처리용)
 @shared_task
 def delete_s3_object(file_key):
-    if not file_key:
-        return
-
-    try:
-        s3_client = get_boto3_client()
-        s3_client.delete_object(Bucket=settings.AWS_BUCKET_NAME, Key=file_key)
-        print(f"Successfully deleted {file_key} from S3.")
-    except Exception as e:
-        print(f"Error deleting {file_key} from S3: {e}")
+    s3_gc.queue_s3_deletes([file_key])
@@ -0,0 +1,171 @@
+import gzip
+import json
+import zlib
+from itertools import groupby, islice
+from operator import itemgetter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from rest_framework import serializers
+
+from myapp.canonical_urls import assign_canonical_urls
+from myapp.counters import latest_link_created_at
+from myapp.feed_cache import invalidate_feed_cache
+from myapp.image_variants import schedule_image_variants
+from myapp.link_metadata import schedule_link_metadata
+from myapp.models import Link, LinkCollection, LinkCollectionThumbnail
+from myapp.search import schedule_search_refresh
+from myapp.serializers import LinkCollectionImportSerializer
+from myapp.uploads import claim_uploads
+
+EXPORT_CHUNK_SIZE = 500
+IMPORT_CHUNK_SIZE = 500
+# 잘못된 줄이 많아도 응답이 커지지 않도록 앞의 일부만 보고
+MAX_REPORTED_ERRORS = 100
+
+
+def export_collections(user, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield one NDJSON line per collection of `user`, with its links and thumbnail.
+
+    Collections and links are read through two `.iterator(chunk_size=...)`
+    cursors (server-side on PostgreSQL) in the same collection order and merged,
+    so memory stays constant however many collections the user has.
+    """
+    collections = (LinkCollection.objects
+                   .filter(owner=user)
+                   .order_by('pk')
+                   .values_list('pk', 'title', 'description', 'is_public', 'created_at', 'thumbnail__image_url')
+                   .iterator(chunk_size=chunk_size))
+    links = (Link.objects
+             .filter(collection__owner=user)
+             .order_by('collection_id', 'pk')
+             .values_list('collection_id', 'title', 'url', 'description')
+             .iterator(chunk_size=chunk_size))
+
+    links_by_collection = groupby(links, key=itemgetter(0))
+    next_links = next(links_by_collection, None)
+
+    for pk, title, description, is_public, created_at, thumbnail_image_url in collections:
+        collection_links = []
+
+        # 두 커서 모두 컬렉션 순서로 정렬되어 있으므로 앞에서부터 맞춰 나감
+        while next_links is not None and next_links[0] <= pk:
+            if next_links[0] == pk:
+                collection_links = [
+                    {'title': link_title, 'url': url, 'description': link_description}
+                    for _, link_title, url, link_description in next_links[1]
+                ]
+            next_links = next(links_by_collection, None)
+
+        row = {
+            'title': title,
+            'description': description,
+            'is_public': is_public,
+            'created_at': created_at,
+            'thumbnail_image_url': thumbnail_image_url,
+            'links': collection_links,
+        }
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False).encode() + b'\n'
+
+def gzip_stream(chunks):
+    compressor = zlib.compressobj(wbits=31)  # 31: gzip 헤더/트레일러 포함
+
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
+
+async def aiterate(iterator, batch_size=EXPORT_CHUNK_SIZE):
+    """
+    Async iterator over a sync `iterator` that reads the database, for a
+    StreamingHttpResponse served under ASGI (Django would otherwise read a sync
+    iterator into a list before sending the first byte). Items are pulled
+    `batch_size` at a time on the sync thread, which owns the DB cursors.
+    """
+    next_batch = sync_to_async(lambda: list(islice(iterator, batch_size)))
+
+    try:
+        while batch := await next_batch():
+            for item in batch:
+                yield item
+    finally:
+        # 클라이언트가 연결을 끊어도 서버 측 커서는 만든 스레드에서 닫음
+        if hasattr(iterator, 'close'):
+            await sync_to_async(iterator.close)()
+
+def open_import_stream(stream, compressed):
+    return gzip.GzipFile(fileobj=stream, mode='rb') if compressed else stream
+
+def import_collections(user, lines, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Create collections for `user` from NDJSON `lines` (bytes), `chunk_size` rows at a time.
+
+    Each chunk is validated and written with `bulk_create` in its own
+    transaction. Invalid lines are skipped and reported. Returns a summary dict.
+    """
+    serializer = LinkCollectionImportSerializer()
+    summary = {'collections': 0, 'links': 0, 'errors': [], 'error_count': 0}
+    numbered_lines = enumerate(lines, 1)
+
+    while chunk := list(islice(numbered_lines, chunk_size)):
+        rows = []
+
+        for line_number, line in chunk:
+            if not line.strip():
+                continue
+
+            try:
+                rows.append(serializer.run_validation(json.loads(line)))
+            except (ValueError, serializers.ValidationError) as e:
+                summary['error_count'] += 1
+                if len(summary['errors']) < MAX_REPORTED_ERRORS:
+                    summary['errors'].append({'line': line_number, 'error': getattr(e, 'detail', str(e))})
+
+        collections, links = write_import_chunk(user, rows)
+        summary['collections'] += collections
+        summary['links'] += links
+
+    return summary
+
+@transaction.atomic
+def write_import_chunk(user, rows):
+    if not rows:
+        return 0, 0
+
+    collections = LinkCollection.objects.bulk_create([
+        LinkCollection(owner=user, title=row['title'], description=row.get('description', ''),
+                       is_public=row.get('is_public', False), links_count=len(row.get('links', [])))
+        for row in rows
+    ])
+
+    # bulk_create는 post_save를 보내지 않으므로 썸네일 행도 직접 생성
+    thumbnails = LinkCollectionThumbnail.objects.bulk_create([
+        LinkCollectionThumbnail(collection=collection, image_url=row.get('thumbnail_image_url'))
+        for collection, row in zip(collections, rows)
+    ])
+    claim_uploads(*(row['thumbnail_image_url'] for row in rows if row.get('thumbnail_image_url')))
+    schedule_image_variants('thumbnail', *(thumbnail.pk for thumbnail in thumbnails if thumbnail.image_url))
+
+    links = [
+        Link(collection=collection, **link)
+        for collection, row in zip(collections, rows)
+        for link in row.get('links', [])
+    ]
+    assign_canonical_urls(links)
+    Link.objects.bulk_create(links, batch_size=settings.LINK_BATCH_SIZE)
+
+    # 링크의 created_at은 bulk_create 시점에 정해지므로 청크마다 한 번의 UPDATE로 채움
+    (LinkCollection.objects
+     .filter(pk__in=[collection.pk for collection in collections], links_count__gt=0)
+     .update(last_link_added_at=latest_link_created_at()))
+
+    schedule_search_refresh([collection.pk for collection in collections])
+    schedule_link_metadata([link.pk for link in links])
+    invalidate_feed_cache()
+
+    return len(collections), len(links)
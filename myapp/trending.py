@@ -0,0 +1,106 @@
+"""
+Time-decayed "trending" scores for collections.
+
+Each like or first view adds `weight * 2 ** ((t - TRENDING_EPOCH) / half_life)`
+to a collection's score, so activity loses half of its weight per half-life
+relative to newer activity. Scores are stored as natural logs, which keeps
+them in float range however far `t` is from the epoch and means stored scores
+never need to be decayed: ordering by the log is ordering by the decayed sum.
+
+`refresh_trending_scores` only recomputes collections with activity since the
+last run, from their events within TRENDING_HORIZON_HALF_LIVES half-lives, so
+running it twice gives the same scores. Likes and views from before their times
+were recorded have a NULL `created_at` and never count.
+"""
+import logging
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from myapp.models import LinkCollection, LinkCollectionLike, LinkCollectionViewModel
+from myapp.utils import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+TRENDING_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+# 이보다 오래된 활동의 가중치는 1/2**7 미만이므로 다시 계산할 때 무시
+TRENDING_HORIZON_HALF_LIVES = 7
+TRENDING_WATERMARK_KEY = 'trending:watermark'
+TRENDING_LOCK_KEY = 'trending:refresh-lock'
+# 트랜잭션이 늦게 커밋되어 워터마크 이전 시각으로 들어온 활동도 다시 보도록 겹쳐서 조회
+TRENDING_OVERLAP = timedelta(minutes=5)
+TRENDING_CHUNK_SIZE = 1000
+
+# (model, weight): a like counts three times as much as a first view
+TRENDING_EVENTS = (
+    (LinkCollectionLike, 3.0),
+    (LinkCollectionViewModel, 1.0),
+)
+
+
+def half_life():
+    return timedelta(hours=settings.TRENDING_HALF_LIFE_HOURS)
+
+def event_score(weight, created_at):
+    """Log of one event's contribution."""
+    return math.log(weight) + math.log(2) * ((created_at - TRENDING_EPOCH) / half_life())
+
+def combine_scores(scores):
+    """log(sum(exp(score))) without overflowing."""
+    top = max(scores)
+    return top + math.log(sum(math.exp(score - top) for score in scores))
+
+def compute_trending_scores(collection_ids, now):
+    since = now - half_life() * TRENDING_HORIZON_HALF_LIVES
+    scores = defaultdict(list)
+
+    for model, weight in TRENDING_EVENTS:
+        events = (model.objects
+                  .filter(collection_id__in=collection_ids, created_at__gte=since)
+                  .values_list('collection_id', 'created_at'))
+
+        for collection_id, created_at in events.iterator():
+            scores[collection_id].append(event_score(weight, created_at))
+
+    # 범위 안의 활동이 모두 취소된 컬렉션(좋아요 취소 등)은 0
+    return {collection_id: combine_scores(scores[collection_id]) if scores[collection_id] else 0.0
+            for collection_id in collection_ids}
+
+def get_active_collection_ids(since):
+    collection_ids = set()
+
+    for model, _ in TRENDING_EVENTS:
+        collection_ids.update(model.objects.filter(created_at__gt=since).values_list('collection_id', flat=True))
+
+    return collection_ids
+
+def refresh_trending_scores(now=None):
+    """Recompute the scores of collections with likes or views since the last run. Returns the number updated."""
+    client = get_redis_client()
+    lock = client.lock(TRENDING_LOCK_KEY, timeout=600)
+    if not lock.acquire(blocking=False):
+        return 0
+
+    try:
+        now = now or timezone.now()
+        watermark = client.get(TRENDING_WATERMARK_KEY)
+        since = (datetime.fromisoformat(watermark.decode()) - TRENDING_OVERLAP if watermark
+                 else now - half_life() * TRENDING_HORIZON_HALF_LIVES)
+
+        collection_ids = sorted(get_active_collection_ids(since))
+
+        for offset in range(0, len(collection_ids), TRENDING_CHUNK_SIZE):
+            scores = compute_trending_scores(collection_ids[offset:offset + TRENDING_CHUNK_SIZE], now)
+            LinkCollection.objects.bulk_update(
+                [LinkCollection(pk=collection_id, trending_score=score) for collection_id, score in scores.items()],
+                ['trending_score'],
+            )
+
+        client.set(TRENDING_WATERMARK_KEY, now.isoformat())
+        return len(collection_ids)
+
+    finally:
+        lock.release()
@@ -0,0 +1,92 @@
+"""
+Ledger of presigned uploads, so objects that were uploaded but never saved as
+a thumbnail or avatar can be removed from the bucket.
+
+`record_upload` adds the key when a presigned URL is handed out and
+`claim_uploads` marks it once a thumbnail or avatar is saved with its URL.
+`sweep_orphaned_uploads` lists the upload prefixes page by page and deletes
+objects whose ledger entry is still unclaimed after UPLOAD_SWEEP_GRACE_HOURS.
+Objects without an entry (uploaded before the ledger existed) are left alone.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from myapp.models import PendingUpload
+from myapp.s3_gc import cloudfront_key, delete_batch
+from myapp.utils import get_boto3_client, get_redis_client
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_PREFIXES = ('thumbnails/', 'avatar/')
+MAX_KEY_LENGTH = PendingUpload._meta.get_field('key').max_length
+UPLOAD_SWEEP_LOCK_KEY = 'uploads:sweep-lock'
+# ListObjectsV2 한 페이지의 최대 키 수이자 DeleteObjects 한 번의 최대 키 수
+SWEEP_PAGE_SIZE = 1000
+
+
+def record_upload(key, user):
+    PendingUpload.objects.create(key=key, owner=user if user.is_authenticated else None)
+
+def claim_uploads(*urls):
+    """Mark the uploads behind `urls` as used; URLs that aren't ours or weren't presigned are ignored."""
+    keys = [key for key in map(cloudfront_key, urls) if key]
+
+    if keys:
+        PendingUpload.objects.filter(key__in=keys, claimed_at__isnull=True).update(claimed_at=timezone.now())
+
+def find_orphans(objects, cutoff):
+    """Keys among one ListObjectsV2 page whose unclaimed ledger entry is older than `cutoff`."""
+    keys = [obj['Key'] for obj in objects if obj['LastModified'] < cutoff]
+
+    if not keys:
+        return []
+
+    return list(PendingUpload.objects
+                .filter(key__in=keys, claimed_at__isnull=True, created_at__lt=cutoff)
+                .values_list('key', flat=True))
+
+def sweep_orphaned_uploads(now=None):
+    """
+    Delete uploads that were never claimed, one ListObjectsV2 page at a time,
+    then drop ledger entries past the grace period. Returns the number of objects deleted.
+    """
+    lock = get_redis_client().lock(UPLOAD_SWEEP_LOCK_KEY, timeout=3600)
+    if not lock.acquire(blocking=False):
+        return 0
+
+    try:
+        cutoff = (now or timezone.now()) - timedelta(hours=settings.UPLOAD_SWEEP_GRACE_HOURS)
+        s3_client = get_boto3_client()
+        paginator = s3_client.get_paginator('list_objects_v2')
+        listed = deleted = 0
+        failed_keys = []
+
+        for prefix in UPLOAD_PREFIXES:
+            pages = paginator.paginate(Bucket=settings.AWS_BUCKET_NAME, Prefix=prefix,
+                                       PaginationConfig={'PageSize': SWEEP_PAGE_SIZE})
+
+            # 페이지마다 바로 비교하고 지우므로 전체 목록을 메모리에 올리지 않음
+            for page in pages:
+                objects = page.get('Contents', [])
+                listed += len(objects)
+                orphans = find_orphans(objects, cutoff)
+
+                if orphans:
+                    failed, _ = delete_batch(s3_client, orphans)
+                    failed_keys.extend(failed)
+                    deleted += len(orphans) - len(failed)
+
+        # 유예 기간이 지난 항목은 사용됐거나, 지웠거나, 업로드되지 않은 것이므로 정리 (지우지 못한 키는 다음에 다시 시도)
+        (PendingUpload.objects
+         .filter(created_at__lt=cutoff)
+         .exclude(key__in=failed_keys)
+         .delete())
+
+        logger.info("Upload sweep: listed %d objects, deleted %d orphans, %d failed", listed, deleted, len(failed_keys))
+        return deleted
+
+    finally:
+        lock.release()
@@ -1,8 +1,10 @@
-from django.urls import path
+from django.conf import settings
+from django.urls import path, re_path
 from rest_framework.routers import DefaultRouter
 
 from myapp.views import LinkCollectionView, LinkView, UserView, kakao_login, \
-    get_kakao_redirect_uri, kakao_logout, get_kakao_logout_redirect_uri
+    get_kakao_redirect_uri, kakao_logout, get_kakao_logout_redirect_uri, collection_detail, \
+    collection_via_share_link, my_collections, owned_or_all_collections
 
 router = DefaultRouter()
 router.register(r'link-collections', LinkCollectionView, basename='link-collections')
@@ -15,4 +17,14 @@ urlpatterns = [
     path('auth/kakao-logout-redirect-uri/', get_kakao_logout_redirect_uri, name='kakao-logout-redirect-uri'),
     path('auth/kakao-logout/', kakao_logout, name='kakao-logout'),
 ]
+
+if settings.ASYNC_READ_VIEWS:
+    # 라우터보다 먼저 매칭되도록 앞에 둠
+    urlpatterns += [
+        path('link-collections/owned-or-all/', owned_or_all_collections),
+        path('link-collections/mine/', my_collections),
+        re_path(r'^link-collections/(?P<share_uuid>[0-9a-f-]{36})/$', collection_via_share_link),
+        path('link-collections/<int:pk>/', collection_detail),
+    ]
+
 urlpatterns += router.urls
@@ -1,19 +1,178 @@
+import asyncio
+import os
+import threading
+import weakref
+
 import boto3
+import redis
+import redis.asyncio
 import redis.client
 from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+
+class ClientRegistry:
+    """
+    Process-wide Redis connection pools and boto3 clients.
+
+    Clients are built lazily on first use and then shared by every request
+    and task in the process. After a fork (gunicorn/uvicorn workers, Celery
+    prefork children) the child drops the inherited pools and clients and
+    builds its own, so sockets are never shared across processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+        self._redis_pools = {}
+        self._async_redis_pools = weakref.WeakKeyDictionary()
+        self._boto3_clients = {}
+        self._boto3_session = None
+
+    def reset(self):
+        # 부모 프로세스의 소켓을 닫지 않도록 disconnect 없이 참조만 버린다
+        with self._lock:
+            self._pid = os.getpid()
+            self._redis_pools = {}
+            self._async_redis_pools = weakref.WeakKeyDictionary()
+            self._boto3_clients = {}
+            self._boto3_session = None
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            self.reset()
+
+    def redis(self, db=0):
+        self._check_pid()
+        pool = self._redis_pools.get(db)
+
+        if pool is None:
+            with self._lock:
+                pool = self._redis_pools.get(db)
+
+                if pool is None:
+                    pool = redis.ConnectionPool(host=settings.REDIS_HOST,
+                                                password=settings.REDIS_PASS,
+                                                db=db,
+                                                health_check_interval=30)
+                    self._redis_pools[db] = pool
+
+        return redis.client.StrictRedis(connection_pool=pool)
+
+    def async_redis(self, db=0):
+        """
+        `redis.asyncio` client for the running event loop. asyncio connections
+        are bound to the loop that opened them, so pools are kept per loop.
+        """
+        self._check_pid()
+        pools = self._async_redis_pools.setdefault(asyncio.get_running_loop(), {})
+        pool = pools.get(db)
+
+        if pool is None:
+            pool = redis.asyncio.ConnectionPool(host=settings.REDIS_HOST,
+                                                password=settings.REDIS_PASS,
+                                                db=db,
+                                                health_check_interval=30)
+            pools[db] = pool
+
+        return redis.asyncio.StrictRedis(connection_pool=pool)
+
+    def boto3(self, service_name='s3'):
+        self._check_pid()
+        client = self._boto3_clients.get(service_name)
+
+        if client is None:
+            # boto3 세션은 thread-safe 하지 않으므로 클라이언트 생성만 락으로 보호 (생성된 클라이언트는 thread-safe)
+            with self._lock:
+                client = self._boto3_clients.get(service_name)
+
+                if client is None:
+                    if self._boto3_session is None:
+                        self._boto3_session = boto3.session.Session(
+                            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                            region_name=settings.AWS_REGION_NAME,
+                        )
+                    client = self._boto3_session.client(service_name)
+                    self._boto3_clients[service_name] = client
 
+        return client
+
+    def warm_up(self, redis_dbs=(0,), services=('s3',)):
+        for db in redis_dbs:
+            self.redis(db)
+
+        for service_name in services:
+            self.boto3(service_name)
+
+    def health_check(self):
+        """Ping every client built so far and return {name: bool}."""
+        self._check_pid()
+        results = {}
+
+        for db in list(self._redis_pools):
+            try:
+                results[f'redis:{db}'] = bool(self.redis(db).ping())
+            except redis.RedisError:
+                results[f'redis:{db}'] = False
+
+        if 's3' in self._boto3_clients:
+            try:
+                self.boto3('s3').head_bucket(Bucket=settings.AWS_BUCKET_NAME)
+                results['s3'] = True
+            except Exception:
+                results['s3'] = False
+
+        return results
+
+client_registry = ClientRegistry()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=client_registry.reset)
 
 def get_redis_client(db=0):
-    return redis.client.StrictRedis(host=settings.REDIS_HOST,
-                                    password=settings.REDIS_PASS,
-                                    db=db)
+    return client_registry.redis(db)
+
+def get_async_redis_client(db=0):
+    return client_registry.async_redis(db)
 
 def get_boto3_client(service_name='s3'):
-    client = boto3.client(
-        service_name,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_REGION_NAME,
-    )
-
-    return client
\ No newline at end of file
+    return client_registry.boto3(service_name)
+
+def on_commit_once(key, func, items=()):
+    """
+    `transaction.on_commit` that merges callbacks registered under the same
+    `key` at the same savepoint: `func` runs once after commit with the union
+    of every `items`, so deleting 5,000 links refreshes their collections once
+    instead of once per post_delete signal.
+    """
+    connection = transaction.get_connection()
+
+    if not connection.in_atomic_block:
+        transaction.on_commit(lambda: func(set(items)))
+        return
+
+    savepoint_ids = set(connection.savepoint_ids)
+
+    for callback_savepoint_ids, callback, _ in connection.run_on_commit:
+        if (getattr(callback, 'on_commit_key', None) == key and not callback.called
+                and callback_savepoint_ids == savepoint_ids):
+            callback.items.update(items)
+            return
+
+    collected = set(items)
+
+    def callback():
+        callback.called = True
+        func(collected)
+
+    callback.on_commit_key = key
+    callback.items = collected
+    callback.called = False
+    transaction.on_commit(callback)
+
+def json_response(data, status=200):
+    """Render `data` exactly like DRF's JSONRenderer, for views that return plain Django responses."""
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
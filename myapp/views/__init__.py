@@ -1,4 +1,5 @@
 from .collection import LinkCollectionView
+from .async_read import collection_detail, collection_via_share_link, my_collections, owned_or_all_collections
 from .link import LinkView
 from .user import UserView
 from .auth import (
@@ -7,6 +8,10 @@ from .auth import (
 
 __all__ = [
     'LinkCollectionView',
+    'collection_detail',
+    'collection_via_share_link',
+    'my_collections',
+    'owned_or_all_collections',
     'LinkView',
     'UserView',
     'get_kakao_redirect_uri',
@@ -0,0 +1,159 @@
+"""
+Async versions of the read-heavy collection endpoints, routed ahead of the
+viewset when ASYNC_READ_VIEWS is set and the project is served over ASGI.
+
+Token lookups, view recording and the feed and share-link caches use `redis.asyncio`,
+and queries go through the async ORM, so a worker keeps serving other requests
+while one waits on Redis. Writes on the detail URL fall through to the viewset,
+and the read-only endpoints answer them with 405 like the viewset's actions.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed, MethodNotAllowed, NotAuthenticated, \
+    NotFound, PermissionDenied
+from rest_framework.request import Request
+
+from myapp import reactions
+from myapp.authentications import UserTokenAuthentication
+from myapp.counters import arecord_view
+from myapp.feed_cache import acached_feed_response
+from myapp.models import LinkCollection
+from myapp.orderings import order_collections
+from myapp.paginations import get_main_page_pagination
+from myapp.search import asearch_collections
+from myapp.serializers import LinkCollectionSerializer
+from myapp.share_links import acached_share_link_response
+from myapp.utils import json_response
+from .collection import LinkCollectionView, my_collections_queryset, owned_or_all_queryset, prepare_feed
+
+
+def async_api_view(view=None, *, methods=('GET', 'HEAD')):
+    """
+    Authenticate with `UserTokenAuthentication`, answer methods other than
+    `methods` with 405 and turn API exceptions into JSON error responses, the
+    way the viewset would.
+    """
+    if view is None:
+        return functools.partial(async_api_view, methods=methods)
+
+    # 뷰셋처럼 CSRF 검사 대신 405로 응답
+    @csrf_exempt
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        request = Request(request)
+
+        try:
+            user_auth = await UserTokenAuthentication().aauthenticate(request)
+            request.user, request.auth = user_auth if user_auth is not None else (AnonymousUser(), None)
+
+            if request.method not in methods:
+                raise MethodNotAllowed(request.method)
+
+            return await view(request, *args, **kwargs)
+
+        except APIException as exc:
+            # authenticate_header가 없으므로 DRF처럼 401 대신 403
+            if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+                exc.status_code = status.HTTP_403_FORBIDDEN
+
+            data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            response = json_response(data, status=exc.status_code)
+
+            if isinstance(exc, MethodNotAllowed):
+                response['Allow'] = ', '.join(methods)
+
+            return response
+
+    return wrapper
+
+async def get_feed_data(request, qs, serializer_context):
+    serializer_class, qs = prepare_feed(request, qs)
+
+    pagination = get_main_page_pagination(request)
+    page = await pagination.apaginate_queryset(qs, request)
+    page = await reactions.aattach_memberships(page, request.user)
+
+    serializer = serializer_class(page, many=True, context=serializer_context)
+    return pagination.get_paginated_response(serializer.data).data
+
+async def list_owned_or_all(request):
+    search_word = request.GET.get('search', None)
+    filter_word = request.GET.get('filter', 'relevance' if search_word else 'likes')
+
+    qs = owned_or_all_queryset(request.user)
+
+    if search_word is not None:
+        qs = await asearch_collections(qs, search_word)
+
+    qs = order_collections(qs, filter_word, search_word)
+
+    serializer_context = {
+        'request': request,
+        'filter_word': filter_word,
+    }
+    return await get_feed_data(request, qs, serializer_context)
+
+@async_api_view
+async def owned_or_all_collections(request):
+    if not request.user.is_authenticated:
+        return await acached_feed_response(request, lambda: list_owned_or_all(request))
+
+    return json_response(await list_owned_or_all(request))
+
+@async_api_view
+async def my_collections(request):
+    if not request.user.is_authenticated:
+        raise NotAuthenticated()
+
+    filter_word = request.GET.get('filter', 'latest')
+    qs = order_collections(my_collections_queryset(request.user), filter_word)
+
+    serializer_context = {
+        'request': request,
+        'filter_word': filter_word,
+    }
+    return json_response(await get_feed_data(request, qs, serializer_context))
+
+def detail_queryset():
+    return LinkCollectionSerializer.setup_eager_loading(LinkCollection.objects.select_related('owner', 'thumbnail'))
+
+@async_api_view
+async def retrieve_collection(request, pk):
+    user = request.user
+
+    try:
+        collection = await detail_queryset().aget(pk=pk)
+    except LinkCollection.DoesNotExist:
+        raise NotFound('No LinkCollection matches the given query.')
+
+    if not collection.is_public and collection.owner != user:
+        raise PermissionDenied() if user.is_authenticated else NotAuthenticated()
+
+    await reactions.aattach_memberships([collection], user)
+
+    if user.is_authenticated:
+        await arecord_view(collection_id=collection.pk, user_id=user.pk)
+
+    return json_response(LinkCollectionSerializer(collection, context={'request': request}).data)
+
+sync_collection_detail = LinkCollectionView.as_view({
+    'get': 'retrieve',
+    'put': 'update',
+    'patch': 'partial_update',
+    'delete': 'destroy',
+})
+
+@csrf_exempt
+async def collection_detail(request, pk):
+    if request.method in ('GET', 'HEAD'):
+        return await retrieve_collection(request, pk)
+
+    return await sync_to_async(sync_collection_detail)(request, pk=pk)
+
+@async_api_view
+async def collection_via_share_link(request, share_uuid):
+    return await acached_share_link_response(share_uuid)
@@ -8,6 +8,7 @@ from rest_framework import status
 from rest_framework.decorators import api_view, authentication_classes
 from rest_framework.response import Response
 
+from myapp.authentications import revoke_token
 from myapp.utils import get_redis_client
 
 
@@ -87,7 +88,6 @@ def get_kakao_logout_redirect_uri(request):
 
 @api_view(['POST'])
 def kakao_logout(request):
-    client = get_redis_client()
-    client.delete(request.token)
+    revoke_token(request.auth)
 
     return Response({"message": "logged out"})
@@ -3,36 +3,76 @@ from datetime import timedelta
 
 from botocore.exceptions import ClientError
 from django.conf import settings
-from django.db.models import Q, Count, OuterRef, Exists
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q, OuterRef, Exists
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from django.db import transaction
 
-from myapp.models import LinkCollection, LinkCollectionLike, Bookmark, LinkCollectionThumbnail
-from myapp.paginations import MainPageLinkCollectionPagination
+from myapp import reactions, stats, transfer
+from myapp.counters import record_view
+from myapp.feed_cache import cached_feed_response
+from myapp.image_variants import schedule_image_variants, variant_keys
+from myapp.models import LinkCollection, LinkCollectionLike, LinkCollectionThumbnail
+from myapp.orderings import order_collections
+from myapp.paginations import get_main_page_pagination
 from myapp.permissions import IsOwnerOrReadOnly
-from myapp.serializers import LinkCollectionSerializer
-from myapp.tasks import save_view_model, delete_s3_object
+from myapp.s3_gc import cloudfront_key, schedule_s3_deletes
+from myapp.search import search_collections
+from myapp.serializers import LinkCollectionSerializer, LinkCollectionFeedSerializer
+from myapp.uploads import MAX_KEY_LENGTH, claim_uploads, record_upload
+from myapp.share_links import cached_share_link_response, invalidate_share_links
 from myapp.utils import get_boto3_client
 
 
+def owned_or_all_queryset(user):
+    base_qs = LinkCollection.objects.select_related('owner', 'thumbnail')
+
+    if not user.is_authenticated:
+        return base_qs.filter(is_public=True)
+
+    return base_qs.filter(Q(is_public=True) | Q(owner=user))
+
+def my_collections_queryset(user):
+    return LinkCollection.objects.select_related('owner', 'thumbnail').filter(owner=user)
+
+def prepare_feed(request, qs):
+    """Serializer class and eager loading for a feed: link previews, or every link with `?expand=links`."""
+    if 'links' in request.GET.get('expand', '').split(','):
+        return LinkCollectionSerializer, LinkCollectionSerializer.setup_eager_loading(qs)
+
+    return LinkCollectionFeedSerializer, LinkCollectionFeedSerializer.setup_eager_loading(qs)
+
+
 class LinkCollectionView(ModelViewSet):
-    queryset = (LinkCollection.objects
-                .select_related('owner', 'thumbnail')
-                .annotate(total_likes=Count('likes'), view_counts=Count('views'))
-                .prefetch_related('links').all())
+    queryset = LinkCollection.objects.all()
     serializer_class = LinkCollectionSerializer
     permission_classes = [IsOwnerOrReadOnly]
 
+    # 전체 직렬화(링크, 썸네일 포함)를 응답하는 액션
+    SERIALIZED_ACTIONS = {'list', 'retrieve', 'update', 'partial_update'}
+    # 좋아요/즐겨찾기 여부를 함께 응답하는 읽기 액션
+    MEMBERSHIP_ACTIONS = {'list', 'retrieve'}
+
     def get_queryset(self):
+        """
+        Build only what the action reads: owner for the permission checks, the
+        related rows the serializer renders, and `Exists` subqueries for the
+        user's like and bookmark on authenticated reads. No aggregate joins.
+        """
         user = self.request.user
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('owner')
+
+        if self.action in self.SERIALIZED_ACTIONS:
+            queryset = LinkCollectionSerializer.setup_eager_loading(queryset.select_related('thumbnail'))
 
-        if user.is_authenticated:
+        if self.action in self.MEMBERSHIP_ACTIONS and user.is_authenticated:
             likes_subquery = LinkCollectionLike.objects.filter(
                 collection=OuterRef('pk'),
                 liker=user
@@ -44,7 +84,7 @@ class LinkCollectionView(ModelViewSet):
                 is_liked=Exists(likes_subquery),
                 is_bookmarked=Exists(bookmarks_subquery)
             )
-        
+
         return queryset
 
     @transaction.atomic
@@ -52,7 +92,13 @@ class LinkCollectionView(ModelViewSet):
         thumbnail_image_url = serializer.validated_data.pop('thumbnail_image_url', None)
         collection = serializer.save(owner=self.request.user)
         if thumbnail_image_url:
-            LinkCollectionThumbnail.objects.create(collection=collection, image_url=thumbnail_image_url)
+            # 빈 썸네일 행은 post_save 시그널이 이미 만들었으므로 URL만 채움
+            thumbnail, _ = LinkCollectionThumbnail.objects.update_or_create(collection=collection,
+                                                                            defaults={'image_url': thumbnail_image_url})
+            # 응답이 시그널이 만든 빈 행을 직렬화하지 않도록 캐시를 교체
+            collection.thumbnail = thumbnail
+            claim_uploads(thumbnail_image_url)
+            schedule_image_variants('thumbnail', thumbnail.pk)
 
     @transaction.atomic
     def perform_update(self, serializer):
@@ -61,22 +107,22 @@ class LinkCollectionView(ModelViewSet):
 
         if thumbnail_image_url:
             thumbnail, created = LinkCollectionThumbnail.objects.get_or_create(collection=collection)
-            old_thumbnail_key = None
-            if not created and thumbnail.image_url:
-                old_thumbnail_key = thumbnail.image_url.replace(settings.AWS_CLOUDFRONT_URL + '/', '')
-            
+            if created or thumbnail.image_url != thumbnail_image_url:
+                # 트랜잭션이 커밋된 뒤에만 이전 썸네일과 그 변형을 지움
+                schedule_s3_deletes(cloudfront_key(thumbnail.image_url), *variant_keys(thumbnail.variants))
+                schedule_image_variants('thumbnail', thumbnail.pk)
+                thumbnail.variants = {}
+
             thumbnail.image_url = thumbnail_image_url
             thumbnail.save()
-
-            if old_thumbnail_key:
-                delete_s3_object.delay(old_thumbnail_key)
+            claim_uploads(thumbnail_image_url)
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
 
         if request.user.is_authenticated:
-            save_view_model.delay(collection_id=instance.pk, user_id=request.user.pk)
+            record_view(collection_id=instance.pk, user_id=request.user.pk)
 
         return Response(serializer.data)
 
@@ -89,6 +135,9 @@ class LinkCollectionView(ModelViewSet):
             return Response(status=status.HTTP_400_BAD_REQUEST, data={"error": "fileName and fileType are required."})
 
         s3_file_key = f"thumbnails/{uuid.uuid4()}_{file_name}"
+        if len(s3_file_key) > MAX_KEY_LENGTH:
+            return Response(status=status.HTTP_400_BAD_REQUEST, data={"error": "fileName is too long."})
+
         s3_client = get_boto3_client()
 
         try:
@@ -99,55 +148,88 @@ class LinkCollectionView(ModelViewSet):
                         'ContentType': file_type},
                 ExpiresIn=600  # 10 minutes
             )
+            # 업로드 후 썸네일로 저장되지 않으면 uploads.sweep_orphaned_uploads가 지움
+            record_upload(s3_file_key, request.user)
             image_url = f"{settings.AWS_CLOUDFRONT_URL}/{s3_file_key}"
             return Response({"presignedUrl": presigned_url, "imageUrl": image_url})
         except ClientError as e:
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)})
 
-    @action(detail=True, methods=['post'], url_path='toggle-bookmark')
-    def toggle_bookmark(self, request, pk=None):
+    def get_bookmarkable_collection(self):
         collection = self.get_object()
-        user = request.user
-
-        bookmark = Bookmark.objects.get(owner=user)
 
-        if bookmark.collections.filter(pk=collection.pk).exists():
-            bookmark.collections.remove(collection)
+        # 다른 사용자의 비공개 링크 모음은 존재 여부도 알리지 않음
+        if not collection.is_public and collection.owner != self.request.user:
+            raise NotFound
 
-            return Response({"status": "removed"})
+        return collection
 
-        else:
-            bookmark.collections.add(collection)
+    @action(detail=True, methods=['post'], url_path='toggle-bookmark', permission_classes=[IsAuthenticated])
+    def toggle_bookmark(self, request, pk=None):
+        collection = self.get_bookmarkable_collection()
 
+        if reactions.change_bookmark(collection.pk, request.user.pk):
             return Response({"status": "added"})
 
+        return Response({"status": "removed"})
+
+    @action(detail=True, methods=['put', 'delete'], url_path='bookmark', permission_classes=[IsAuthenticated])
+    def bookmark(self, request, pk=None):
+        """Idempotent bookmark: PUT adds, DELETE removes, repeating either is a no-op."""
+        collection = self.get_bookmarkable_collection()
+        mode = reactions.ADD if request.method == 'PUT' else reactions.REMOVE
+
+        return Response({"is_bookmarked": reactions.change_bookmark(collection.pk, request.user.pk, mode)})
+
+    @action(detail=True, methods=['get'], url_path='stats', permission_classes=[IsAuthenticated])
+    def stats(self, request, pk=None):
+        """Daily views and likes for `?start=` to `?end=` (ISO dates), from the rollups. Owner only."""
+        collection = self.get_object()
+
+        if collection.owner != request.user:
+            return Response(status=status.HTTP_403_FORBIDDEN, data={"error": "링크 모음의 소유자만 통계를 볼 수 있습니다."})
+
+        try:
+            start, end = stats.parse_date_range(request.GET)
+        except ValueError as e:
+            return Response(status=status.HTTP_400_BAD_REQUEST, data={"error": str(e)})
+
+        return Response({
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "series": stats.daily_series(collection.pk, start, end),
+        })
+
     @action(detail=True, methods=['post'], url_path='generate-share-link')
     def generate_share_link(self, request, pk=None):
         collection = self.get_object()
 
         expire_date = request.data.get("expireDate", 9999)
+        old_share_uuid = collection.share_uuid
 
         if collection.is_expired:
             collection.share_uuid = uuid.uuid4()
 
         collection.expire_date = timezone.now() + timedelta(days=expire_date)
         collection.save()
+        invalidate_share_links(old_share_uuid, collection.share_uuid)
 
         return Response({"share_link": f"http://localhost:8080/collections/{collection.share_uuid}"})
 
     @action(detail=False, methods=['get'], url_path='(?P<share_uuid>[0-9a-f-]{36})', permission_classes=[AllowAny])
     def get_collection_via_share_link(self, request, share_uuid, pk=None):
-        try:
-            collection = LinkCollection.objects.get(share_uuid=share_uuid)
+        return cached_share_link_response(share_uuid)
 
-            if collection.is_expired or str(collection.share_uuid) != share_uuid:
-                return Response(status=status.HTTP_404_NOT_FOUND, data={"error": "링크가 만료되었거나 잘못된 링크입니다."})
+    def get_likeable_collection(self, request):
+        collection = self.get_object()
 
-            serializer = self.get_serializer(collection)
-            return Response(serializer.data)
+        if not collection.is_public and collection.owner != request.user:
+            return None, Response(status=status.HTTP_403_FORBIDDEN, data={"error": "비공개 링크 모음입니다."})
+
+        if collection.owner == request.user:
+            return None, Response(status=status.HTTP_403_FORBIDDEN, data={"error": "Self-like is forbidden."})
 
-        except LinkCollection.DoesNotExist:
-            return Response(status=status.HTTP_404_NOT_FOUND, data={"error": "잘못된 링크입니다."})
+        return collection, None
 
     @action(detail=True, methods=['post'], url_path='toggle-like', permission_classes=[IsAuthenticated])
     def toggle_like(self, request, pk=None):
@@ -156,121 +238,130 @@ class LinkCollectionView(ModelViewSet):
         if not user.is_authenticated:
             return Response(status=status.HTTP_401_UNAUTHORIZED, data={"error": "로그인이 필요합니다."})
 
-        collection = self.get_object()
-        if not collection.is_public and collection.owner != request.user:
-            return Response(status=status.HTTP_403_FORBIDDEN, data={"error": "비공개 링크 모음입니다."})
-
-        if collection.owner == request.user:
-            return Response(status=status.HTTP_403_FORBIDDEN, data={"error": "Self-like is forbidden."})
+        collection, error_response = self.get_likeable_collection(request)
+        if error_response:
+            return error_response
 
         try:
-            qs = LinkCollectionLike.objects.filter(collection=collection, liker=request.user)
-            if qs.exists():
-                qs.delete()
-
-                return Response({"message": "Like deleted."})
-            else:
-                LinkCollectionLike.objects.create(collection=collection, liker=request.user)
-
+            if reactions.change_like(collection.pk, user.pk):
                 return Response({"message": "Like created."})
 
+            return Response({"message": "Like deleted."})
+
         except Exception as e:
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)})
 
+    @action(detail=True, methods=['put', 'delete'], url_path='like', permission_classes=[IsAuthenticated])
+    def like(self, request, pk=None):
+        """Idempotent like: PUT likes, DELETE unlikes, so clients can retry safely."""
+        collection, error_response = self.get_likeable_collection(request)
+        if error_response:
+            return error_response
+
+        mode = reactions.ADD if request.method == 'PUT' else reactions.REMOVE
+
+        return Response({"is_liked": reactions.change_like(collection.pk, request.user.pk, mode)})
+
+    def get_feed_response(self, request, qs, serializer_context):
+        """Paginate a feed and resolve the user's likes and bookmarks for the page only."""
+        serializer_class, qs = prepare_feed(request, qs)
+
+        pagination = get_main_page_pagination(request)
+        page = pagination.paginate_queryset(qs, request)
+
+        if page is not None:
+            page = reactions.attach_memberships(page, request.user)
+            serializer = serializer_class(page, many=True, context=serializer_context)
+            return pagination.get_paginated_response(serializer.data)
+
+        serializer = serializer_class(reactions.attach_memberships(qs, request.user), many=True, context=serializer_context)
+        return Response(serializer.data)
+
     @action(detail=False, methods=['get'], url_path='owned-or-all', permission_classes=[AllowAny])
     def get_owned_or_all_collections(self, request):
-        user = request.user
-        filter_word = request.GET.get('filter', 'likes')
-        search_word = request.GET.get('search', None)
+        # 비로그인 응답은 (filter, search, page)가 같으면 모두 같으므로 캐시
+        if not request.user.is_authenticated:
+            return cached_feed_response(request, lambda: self.list_owned_or_all(request))
 
-        liked_collection_pks = set()
-        bookmarked_collection_pks = set()
+        return self.list_owned_or_all(request)
 
-        if user.is_authenticated:
-            liked_collection_pks = set(
-                LinkCollectionLike.objects.filter(liker=user).values_list('collection_id', flat=True)
-            )
-            bookmarked_collection_pks = set(
-                user.bookmark.collections.values_list('id', flat=True)
-            )
-
-        base_qs = LinkCollection.objects.select_related('owner', 'thumbnail').prefetch_related('links')
+    def list_owned_or_all(self, request):
+        user = request.user
+        search_word = request.GET.get('search', None)
+        filter_word = request.GET.get('filter', 'relevance' if search_word else 'likes')
 
-        if not user.is_authenticated:
-            qs = base_qs.filter(is_public=True)
-        else:
-            qs = base_qs.filter(Q(is_public=True) | Q(owner=user))
+        qs = owned_or_all_queryset(user)
 
         if search_word is not None:
-            qs = qs.filter(title__icontains=search_word)
+            qs = search_collections(qs, search_word)
 
-        if filter_word == 'likes':
-            qs = qs.order_by('-likes_count', '-created_at')
-        elif filter_word == 'views':
-            qs = qs.order_by('-view_counts', '-created_at')
-        else:
-            qs = qs.order_by('-created_at')
-
-        pagination = MainPageLinkCollectionPagination()
-        page = pagination.paginate_queryset(qs, request)
+        qs = order_collections(qs, filter_word, search_word)
 
         serializer_context = {
             'request': request,
-            'liked_collection_pks': liked_collection_pks,
-            'bookmarked_collection_pks': bookmarked_collection_pks,
             'filter_word': filter_word,
         }
-        if page is not None:
-            serializer = self.get_serializer(page, many=True, context=serializer_context)
-            return pagination.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(qs, many=True, context=serializer_context)
-        return Response(serializer.data)
+        return self.get_feed_response(request, qs, serializer_context)
 
     @action(detail=False, methods=['get'], url_path='mine', permission_classes=[IsAuthenticated])
     def get_my_collections(self, request):
         user = request.user
         filter_word = request.GET.get('filter', 'latest')
 
-        liked_collection_pks = set(
-            LinkCollectionLike.objects.filter(liker=user).values_list('collection_id', flat=True)
-        )
-        bookmarked_collection_pks = set(
-            user.bookmark.collections.values_list('id', flat=True)
-        )
-
-        qs = LinkCollection.objects.select_related('owner', 'thumbnail').prefetch_related('links').filter(owner=user)
-
-        if filter_word == 'likes':
-            qs = qs.order_by('-likes_count', '-created_at')
-        elif filter_word == 'views':
-            qs = qs.order_by('-view_counts', '-created_at')
-        else:
-            qs = qs.order_by('-created_at')
-
-        pagination = MainPageLinkCollectionPagination()
-        page = pagination.paginate_queryset(qs, request)
+        qs = order_collections(my_collections_queryset(user), filter_word)
 
         serializer_context = {
             'request': request,
-            'liked_collection_pks': liked_collection_pks,
-            'bookmarked_collection_pks': bookmarked_collection_pks,
             'filter_word': filter_word,
         }
-        if page is not None:
-            serializer = self.get_serializer(page, many=True, context=serializer_context)
-            return pagination.get_paginated_response(serializer.data)
+        return self.get_feed_response(request, qs, serializer_context)
 
-        serializer = self.get_serializer(qs, many=True, context=serializer_context)
-        return Response(serializer.data)
+    @action(detail=False, methods=['get'], url_path='export', permission_classes=[IsAuthenticated])
+    def export_collections(self, request):
+        """Stream every collection of the user as NDJSON, or gzipped NDJSON with `?compression=gzip`."""
+        content = transfer.export_collections(request.user)
+
+        if request.GET.get('compression') == 'gzip':
+            content = transfer.gzip_stream(content)
+            content_type, filename = 'application/gzip', 'collections.ndjson.gz'
+        else:
+            content_type, filename = 'application/x-ndjson', 'collections.ndjson'
+
+        if isinstance(request._request, ASGIRequest):
+            content = transfer.aiterate(content)
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='import', permission_classes=[IsAuthenticated])
+    def import_collections(self, request):
+        """
+        Create collections from an NDJSON body in the export format. Gzipped bodies are
+        accepted with `Content-Type: application/gzip` or `Content-Encoding: gzip`.
+        """
+        # request.data를 쓰지 않고 본문을 한 줄씩 읽어 메모리 사용량을 일정하게 유지
+        if request.stream is None:
+            return Response(status=status.HTTP_400_BAD_REQUEST, data={"error": "NDJSON body required."})
+
+        compressed = request.content_type == 'application/gzip' or request.headers.get('Content-Encoding') == 'gzip'
+
+        try:
+            summary = transfer.import_collections(request.user, transfer.open_import_stream(request.stream, compressed))
+        except (OSError, EOFError) as e:
+            return Response(status=status.HTTP_400_BAD_REQUEST, data={"error": f"Invalid gzip body: {e}"})
+
+        return Response(summary)
 
     @action(detail=True, methods=['delete'], url_path='share-link')
     def delete_share_link(self, request, pk=None):
         collection = self.get_object()
+        old_share_uuid = collection.share_uuid
 
         collection.share_uuid = None
         collection.expire_date = None
 
         collection.save()
+        invalidate_share_links(old_share_uuid)
 
         return Response({"message": "공유 링크가 비활성화되었습니다."})
@@ -1,16 +1,54 @@
-from django.db import transaction
-from rest_framework import status
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Value
+from django.utils import timezone
+from rest_framework import serializers, status
 from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.response import Response
 
+from myapp.canonical_urls import assign_canonical_urls
+from myapp.counters import add_links, remove_links
+from myapp.feed_cache import invalidate_feed_cache
+from myapp.link_metadata import schedule_link_metadata
 from myapp.models import Link, LinkCollection
 from myapp.permissions import IsOwnerOrReadOnly
-from myapp.serializers import LinkSerializer
+from myapp.search import schedule_search_refresh
+from myapp.serializers import LinkSerializer, LinkBatchItemSerializer
+from myapp.share_links import invalidate_collection_share_links
+
+LINKS_TABLE = Link._meta.db_table
+BATCH_UPDATE_FIELDS = ('title', 'url', 'description', 'canonical_url_id', 'updated_at')
+
+
+def bulk_update_links(links, batch_size):
+    """
+    `bulk_update` of BATCH_UPDATE_FIELDS. On PostgreSQL each chunk is one
+    `UPDATE ... FROM (VALUES ...)`, which avoids building a CASE WHEN per row and field.
+    """
+    links = list(links)
+
+    if connection.vendor != 'postgresql':
+        Link.objects.bulk_update(links, BATCH_UPDATE_FIELDS, batch_size=batch_size)
+        return
+
+    columns = ', '.join(BATCH_UPDATE_FIELDS)
+    assignments = ', '.join(f'{field} = source.{field}' for field in BATCH_UPDATE_FIELDS)
+
+    with connection.cursor() as cursor:
+        for offset in range(0, len(links), batch_size):
+            chunk = links[offset:offset + batch_size]
+            values = ', '.join(['(%s, %s, %s, %s, %s::bigint, %s::timestamptz)'] * len(chunk))
+            params = [value for link in chunk for value in (link.pk, *(getattr(link, field) for field in BATCH_UPDATE_FIELDS))]
+            cursor.execute(f'UPDATE {LINKS_TABLE} SET {assignments} '
+                           f'FROM (VALUES {values}) AS source (id, {columns}) WHERE {LINKS_TABLE}.id = source.id', params)
 
 
 class LinkView(ModelViewSet):
-    queryset = Link.objects.all()
+    queryset = Link.objects.select_related('canonical_url__metadata')
     serializer_class = LinkSerializer
     permission_classes = [IsOwnerOrReadOnly]
 
@@ -30,29 +68,134 @@ class LinkView(ModelViewSet):
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
-    @action(methods=['post'], detail=False, url_path='batch')
+    @action(methods=['post'], detail=False, url_path='batch', permission_classes=[IsAuthenticated])
     def batch(self, request):
-        added = request.data.get('added', [])
-        updated = request.data.get('updated', [])
-        deleted = request.data.get('deleted', [])
+        """
+        Apply added/updated/deleted links as set operations and report a result per item.
+
+        Ownership of every referenced collection and link is checked in one query;
+        items that fail validation or belong to someone else are skipped and
+        reported, the rest are written in a single transaction.
+        """
+        batch_size = settings.LINK_BATCH_SIZE
+        added_results, added = self.validate_batch_items(request.data.get('added', []), 'collection_id')
+        updated_results, updated = self.validate_batch_items(request.data.get('updated', []), 'id')
+        deleted_results, deleted_ids = self.validate_batch_ids(request.data.get('deleted', []))
 
         try:
+            owned_collection_ids, owned_links = self.get_owned_ids(
+                request.user,
+                collection_ids={data['collection_id'] for data in added.values()},
+                link_ids={data['id'] for data in updated.values()} | set(deleted_ids.values()),
+            )
+            touched_collection_ids = set()
+            now = timezone.now()
+
             with transaction.atomic():
-                if added:
-                    added_links = [Link(**link) for link in added]
-                    Link.objects.bulk_create(added_links)
+                added_links = {}
+                for index, data in added.items():
+                    if data['collection_id'] in owned_collection_ids:
+                        data.pop('id', None)
+                        added_links[index] = Link(**data)
+                    else:
+                        added_results[index] = {'index': index, 'status': 'not_found'}
+
+                assign_canonical_urls(added_links.values())
+                Link.objects.bulk_create(added_links.values(), batch_size=batch_size)
+                add_links(added_links.values())
+                for index, link in added_links.items():
+                    added_results[index] = {'index': index, 'status': 'created', 'id': link.pk}
+                    touched_collection_ids.add(link.collection_id)
+
+                updated_links = {}
+                for index, data in updated.items():
+                    if data['id'] in owned_links:
+                        updated_links[index] = Link(pk=data['id'], title=data['title'], url=data['url'],
+                                                    description=data.get('description', ''), updated_at=now)
+                    else:
+                        updated_results[index] = {'index': index, 'id': data['id'], 'status': 'not_found'}
+
+                assign_canonical_urls(updated_links.values())
+                bulk_update_links(updated_links.values(), batch_size)
+                for index, link in updated_links.items():
+                    updated_results[index] = {'index': index, 'id': link.pk, 'status': 'updated'}
+                    touched_collection_ids.add(owned_links[link.pk])
 
-                if updated:
-                    print(updated)
-                    updated_links = [Link(**link) for link in updated]
-                    Link.objects.bulk_update(updated_links, ['title', 'url', 'description'])
+                link_ids_to_delete = {link_id for link_id in deleted_ids.values() if link_id in owned_links}
+                Link.objects.filter(pk__in=link_ids_to_delete).delete()
+                remove_links(Counter(owned_links[link_id] for link_id in link_ids_to_delete))
+                for index, link_id in deleted_ids.items():
+                    deleted = link_id in link_ids_to_delete
+                    deleted_results[index] = {'index': index, 'id': link_id, 'status': 'deleted' if deleted else 'not_found'}
+                    if deleted:
+                        touched_collection_ids.add(owned_links[link_id])
 
-                if deleted:
-                    for link in deleted:
-                        Link.objects.get(pk=link['id']).delete()
+                # bulk_create/bulk_update/queryset 삭제는 시그널로 처리되지 않으므로 검색 벡터와 캐시를 직접 갱신
+                schedule_search_refresh(touched_collection_ids)
+                invalidate_feed_cache()
+                invalidate_collection_share_links(touched_collection_ids)
+                schedule_link_metadata([link.pk for link in [*added_links.values(), *updated_links.values()]])
 
-            return Response(status=status.HTTP_200_OK, data={"message": "batch 작업 성공"})
+            return Response(status=status.HTTP_200_OK, data={
+                "message": "batch 작업 성공",
+                "results": {"added": added_results, "updated": updated_results, "deleted": deleted_results},
+            })
 
         except Exception as e:
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)})
 
+    def validate_batch_items(self, items, required_field):
+        """Return (results with an entry per invalid item, {index: validated data})."""
+        results = [None] * len(items)
+        valid = {}
+        # ModelSerializer는 인스턴스마다 필드를 새로 만드므로 하나를 재사용 (ListSerializer와 같은 방식)
+        serializer = LinkBatchItemSerializer()
+
+        for index, item in enumerate(items):
+            try:
+                data = serializer.run_validation(item)
+            except serializers.ValidationError as e:
+                results[index] = {'index': index, 'status': 'invalid', 'errors': e.detail}
+                continue
+
+            if required_field not in data:
+                results[index] = {'index': index, 'status': 'invalid', 'errors': {required_field: ["This field is required."]}}
+            else:
+                valid[index] = data
+
+        return results, valid
+
+    def validate_batch_ids(self, items):
+        results = [None] * len(items)
+        valid = {}
+
+        for index, item in enumerate(items):
+            try:
+                valid[index] = int(item['id'] if isinstance(item, dict) else item)
+            except (KeyError, TypeError, ValueError):
+                results[index] = {'index': index, 'status': 'invalid', 'errors': {'id': ["A valid integer is required."]}}
+
+        return results, valid
+
+    def get_owned_ids(self, user, collection_ids, link_ids):
+        """Return (owned collection ids, {owned link id: collection id}) with a single UNION query."""
+        if not collection_ids and not link_ids:
+            return set(), {}
+
+        collections = (LinkCollection.objects
+                       .filter(owner=user, pk__in=collection_ids)
+                       .values_list(Value('collection'), 'pk', 'pk'))
+        links = (Link.objects
+                 .filter(collection__owner=user, pk__in=link_ids)
+                 .values_list(Value('link'), 'pk', 'collection_id'))
+
+        owned_collection_ids = set()
+        owned_links = {}
+
+        for kind, pk, collection_id in collections.union(links, all=True):
+            if kind == 'collection':
+                owned_collection_ids.add(pk)
+            else:
+                owned_links[pk] = collection_id
+
+        return owned_collection_ids, owned_links
@@ -4,16 +4,20 @@ from botocore.exceptions import ClientError
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import transaction
-from django.db.models import Count
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from myapp.models import Bookmark, LinkCollectionLike, UserAvatar
+from myapp import reactions
+from myapp.authentications import token_user_cache
+from myapp.image_variants import schedule_image_variants, variant_keys
+from myapp.models import Bookmark, UserAvatar
+from myapp.orderings import order_collections
 from myapp.paginations import MainPageLinkCollectionPagination
+from myapp.s3_gc import cloudfront_key, schedule_s3_deletes
 from myapp.serializers import UserSerializer, UserinfoSerializer, LinkCollectionListSerializer
-from myapp.tasks import delete_s3_object
+from myapp.uploads import MAX_KEY_LENGTH, claim_uploads, record_upload
 from myapp.utils import get_boto3_client
 
 
@@ -42,6 +46,9 @@ class UserView(ModelViewSet):
             return Response(status=status.HTTP_400_BAD_REQUEST, data={"error": "fileName and fileType are required."})
 
         s3_file_key = f"avatar/{uuid.uuid4()}_{file_name}"
+        if len(s3_file_key) > MAX_KEY_LENGTH:
+            return Response(status=status.HTTP_400_BAD_REQUEST, data={"error": "fileName is too long."})
+
         s3_client = get_boto3_client()
 
         try:
@@ -52,6 +59,8 @@ class UserView(ModelViewSet):
                         'ContentType': file_type},
                 ExpiresIn=600  # 10 minutes
             )
+            # 업로드 후 아바타로 저장되지 않으면 uploads.sweep_orphaned_uploads가 지움
+            record_upload(s3_file_key, request.user)
             image_url = f"{settings.AWS_CLOUDFRONT_URL}/{s3_file_key}"
             return Response({"presignedUrl": presigned_url, "imageUrl": image_url})
         except ClientError as e:
@@ -66,36 +75,27 @@ class UserView(ModelViewSet):
 
         try:
             bookmark = Bookmark.objects.get(owner=user)
-            qs = bookmark.collections.select_related('owner').prefetch_related('links').all()
-
-            liked_collection_pks = set(
-                LinkCollectionLike.objects.filter(liker=user).values_list('collection_id', flat=True)
-            )
-            bookmarked_collection_pks = set(qs.values_list('id', flat=True))
+            # LinkCollectionListSerializer는 링크를 내보내지 않으므로 prefetch 없이 owner/썸네일만 조인
+            qs = bookmark.collections.select_related('owner', 'thumbnail').all()
 
             filter_word = request.GET.get('filter', 'latest')
-            if filter_word == 'likes':
-                qs = qs.annotate(total_likes=Count('likes')).order_by('-total_likes', '-pk')
-            elif filter_word == 'views':
-                qs = qs.annotate(view_counts=Count('views')).order_by('-view_counts', '-pk')
-            else: # latest
-                qs = qs.order_by('-pk')
+            qs = order_collections(qs, filter_word)
 
             pagination = MainPageLinkCollectionPagination()
             page = pagination.paginate_queryset(qs, request)
 
             serializer_context = {
                 'request': request,
-                'liked_collection_pks': liked_collection_pks,
-                'bookmarked_collection_pks': bookmarked_collection_pks,
                 'filter_word': filter_word,
             }
 
             if page is not None:
+                page = reactions.attach_memberships(page, user)
                 serializer = LinkCollectionListSerializer(page, many=True, context=serializer_context)
                 return pagination.get_paginated_response(serializer.data)
 
-            serializer = LinkCollectionListSerializer(qs, many=True, context=serializer_context)
+            serializer = LinkCollectionListSerializer(reactions.attach_memberships(qs, user), many=True,
+                                                      context=serializer_context)
             return Response(serializer.data)
 
         except Bookmark.DoesNotExist:
@@ -122,7 +122,6 @@ class UserView(ModelViewSet):
             with transaction.atomic():
                 new_nickname = request.data.get('newNickname')
                 new_avatar_url = request.data.get('newUserAvatarUrl')
-                old_avatar_key = None
 
                 if new_nickname and new_nickname != user.username:
                     if User.objects.filter(username=new_nickname).exclude(pk=user.pk).exists():
@@ -132,16 +131,20 @@ class UserView(ModelViewSet):
 
                 if new_avatar_url:
                     avatar, created = UserAvatar.objects.get_or_create(user=user)
-                    if not created and avatar.image_url:
-                        # Extract key from CloudFront URL
-                        old_avatar_key = avatar.image_url.replace(settings.AWS_CLOUDFRONT_URL + '/', '')
-                    
+                    if created or avatar.image_url != new_avatar_url:
+                        # 트랜잭션이 커밋된 뒤에만 이전 아바타와 그 변형을 지움
+                        schedule_s3_deletes(cloudfront_key(avatar.image_url), *variant_keys(avatar.variants))
+                        schedule_image_variants('avatar', avatar.pk)
+                        avatar.variants = {}
+
                     avatar.image_url = new_avatar_url
                     avatar.save()
+                    # 응답이 캐시된 이전 아바타를 직렬화하지 않도록 교체
+                    user.avatar = avatar
+                    claim_uploads(new_avatar_url)
 
-                # After transaction is successful, dispatch cleanup task
-                if old_avatar_key:
-                    delete_s3_object.delay(old_avatar_key)
+            # Cached token -> user entries still hold the old nickname/avatar
+            token_user_cache.invalidate_user(user.pk)
 
             # Return the updated user info
             serializer = UserinfoSerializer(user)
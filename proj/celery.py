@@ -1,6 +1,7 @@
 import os
 
 from celery import Celery
+from celery.signals import worker_init, worker_process_init
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "proj.settings")
 
@@ -8,3 +9,11 @@ celery_app = Celery("app")
 celery_app.config_from_object("django.conf:settings", namespace="CELERY")
 
 celery_app.autodiscover_tasks()
+
+
+@worker_init.connect
+@worker_process_init.connect
+def warm_up_clients(**kwargs):
+    # prefork 자식 프로세스는 fork 이후 자신의 Redis/boto3 클라이언트를 새로 만든다
+    from myapp.utils import client_registry
+    client_registry.warm_up()
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
     'rest_framework',
     'myapp',
@@ -157,9 +158,100 @@ KAKAO_LOGOUT_REDIRECT_URI = os.getenv("KAKAO_LOGOUT_REDIRECT_URI")
 REDIS_HOST = os.getenv("REDIS_HOST")
 REDIS_PASS = os.getenv("REDIS_PASS")
 
+# Token authentication in-process cache (token -> user)
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 10000))
+AUTH_TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", 30))
+
 # Celery configuration
 CELERY_BROKER_URL = f'redis://:{os.getenv("REDIS_PASS")}@{os.getenv("REDIS_HOST")}:6379/1'
 CELERY_RESULT_BACKEND = f'redis://:{os.getenv("REDIS_PASS")}@{os.getenv("REDIS_HOST")}:6379/2'
+CELERY_BEAT_SCHEDULE = {
+    'flush-pending-views': {
+        'task': 'myapp.tasks.flush_pending_views',
+        'schedule': float(os.getenv("VIEW_FLUSH_INTERVAL", 10)),
+    },
+    'reconcile-like-counts': {
+        'task': 'myapp.tasks.reconcile_like_counts',
+        'schedule': float(os.getenv("LIKE_RECONCILE_INTERVAL", 5)),
+    },
+    'reconcile-link-counts': {
+        'task': 'myapp.tasks.reconcile_link_counts',
+        'schedule': float(os.getenv("LINK_COUNT_RECONCILE_INTERVAL", 3600)),
+    },
+    'refresh-trending-scores': {
+        'task': 'myapp.tasks.refresh_trending_scores',
+        'schedule': float(os.getenv("TRENDING_REFRESH_INTERVAL", 300)),
+    },
+    'compact-view-events': {
+        'task': 'myapp.tasks.compact_view_events',
+        'schedule': float(os.getenv("VIEW_COMPACTION_INTERVAL", 86400)),
+    },
+    'rollup-daily-stats': {
+        'task': 'myapp.tasks.rollup_daily_stats',
+        'schedule': float(os.getenv("STATS_ROLLUP_INTERVAL", 600)),
+    },
+    'flush-s3-deletes': {
+        'task': 'myapp.tasks.flush_s3_deletes',
+        'schedule': float(os.getenv("S3_GC_INTERVAL", 60)),
+    },
+    'sweep-orphaned-uploads': {
+        'task': 'myapp.tasks.sweep_orphaned_uploads',
+        'schedule': float(os.getenv("UPLOAD_SWEEP_INTERVAL", 86400)),
+    },
+}
+
+# Likes and views lose half of their weight in the trending score per half-life
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", 24))
+
+# View rows older than this are folded into LinkCollectionViewArchive
+VIEW_RETENTION_DAYS = int(os.getenv("VIEW_RETENTION_DAYS", 90))
+
+# Fetch page metadata (title, og:image, favicon) for saved links in Celery
+LINK_METADATA_FETCH = bool(os.getenv("LINK_METADATA_FETCH"))
+LINK_METADATA_WORKERS = int(os.getenv("LINK_METADATA_WORKERS", 8))
+LINK_METADATA_TIMEOUT = float(os.getenv("LINK_METADATA_TIMEOUT", 5))
+LINK_METADATA_MAX_BYTES = int(os.getenv("LINK_METADATA_MAX_BYTES", 512 * 1024))
+LINK_METADATA_TTL_DAYS = int(os.getenv("LINK_METADATA_TTL_DAYS", 7))
+# Only for development: allows fetching localhost and private network addresses
+LINK_METADATA_ALLOW_PRIVATE_HOSTS = bool(os.getenv("LINK_METADATA_ALLOW_PRIVATE_HOSTS"))
+
+# Replaced avatars and thumbnails are deleted from S3 in DeleteObjects batches (at most 1000 keys)
+S3_DELETE_BATCH_SIZE = int(os.getenv("S3_DELETE_BATCH_SIZE", 1000))
+S3_DELETE_MAX_ATTEMPTS = int(os.getenv("S3_DELETE_MAX_ATTEMPTS", 4))
+S3_DELETE_RETRY_BACKOFF = float(os.getenv("S3_DELETE_RETRY_BACKOFF", 0.5))
+
+# Resize new thumbnails and avatars into WebP variants under resized/ in Celery. The CPU-bound resizing runs on the
+# prefork worker of Dockerfile_celery_images (queue IMAGE_VARIANTS_QUEUE), not on the gevent pool of the main worker;
+# IMAGE_RESIZE_WORKERS images are decoded at once per task
+IMAGE_VARIANTS = bool(os.getenv("IMAGE_VARIANTS"))
+IMAGE_VARIANTS_QUEUE = os.getenv("IMAGE_VARIANTS_QUEUE", "images")
+IMAGE_RESIZE_WORKERS = int(os.getenv("IMAGE_RESIZE_WORKERS", 4))
+IMAGE_MAX_SOURCE_BYTES = int(os.getenv("IMAGE_MAX_SOURCE_BYTES", 20 * 1024 * 1024))
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", 40_000_000))
+IMAGE_WEBP_QUALITY = int(os.getenv("IMAGE_WEBP_QUALITY", 80))
+
+# Presigned uploads not saved as a thumbnail or avatar within this many hours are deleted
+UPLOAD_SWEEP_GRACE_HOURS = float(os.getenv("UPLOAD_SWEEP_GRACE_HOURS", 24))
+
+# Accumulate likes_count changes in Redis instead of updating the collection row per like
+LIKE_COUNTER_BUFFERED = bool(os.getenv("LIKE_COUNTER_BUFFERED"))
+
+# Cache anonymous public feed pages in Redis (invalidated on content writes; likes, views and trending scores
+# only show up once a page expires after the TTL)
+PUBLIC_FEED_CACHE = bool(os.getenv("PUBLIC_FEED_CACHE"))
+PUBLIC_FEED_CACHE_TTL = int(os.getenv("PUBLIC_FEED_CACHE_TTL", 300))
+
+# Cache rendered share-link responses in Redis; unknown/expired links are cached for the negative TTL.
+# Owner profile changes are not invalidated and show up within SHARE_LINK_CACHE_TTL
+SHARE_LINK_CACHE = bool(os.getenv("SHARE_LINK_CACHE"))
+SHARE_LINK_CACHE_TTL = int(os.getenv("SHARE_LINK_CACHE_TTL", 300))
+SHARE_LINK_NEGATIVE_CACHE_TTL = int(os.getenv("SHARE_LINK_NEGATIVE_CACHE_TTL", 60))
+
+# Rows per INSERT/UPDATE statement in links/batch
+LINK_BATCH_SIZE = int(os.getenv("LINK_BATCH_SIZE", 1000))
+
+# Serve the collection read endpoints (detail, feeds, share links) from async views; run under ASGI
+ASYNC_READ_VIEWS = bool(os.getenv("ASYNC_READ_VIEWS"))
 
 # AWS configuration
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")